@@ -0,0 +1,45 @@
+import glob
+import os.path
+import random
+from timeit import timeit
+
+from calculator.field import Field
+from calculator.field import ZpField
+from calculator.parser import Parser
+from calculator.task import FieldType
+
+
+INPUT_PATTERN = os.path.join('INPUT', 'NIST P-*.txt')
+ELEMENTS_COUNT = 100
+REPEAT = 10
+
+
+def _load_moduli():
+    moduli = []
+    for filename in sorted(glob.glob(INPUT_PATTERN)):
+        with open(filename, 'r') as input_f:
+            config = Parser.parse(input_lines=iter(input_f))
+        if config.field_type is FieldType.Z_p:
+            moduli.append((os.path.basename(filename), config.field_args[0]))
+    return sorted(moduli, key=lambda item: item[1])
+
+
+def main():
+    random.seed(0)
+    print(f'{"файл":<20} {"биты":>5} {"Field.invert, мкс":>18} {"ZpField.invert, мкс":>20} {"ускорение":>10}')
+
+    for name, modulus in _load_moduli():
+        field = ZpField(modulus)
+        elements = [random.randrange(1, modulus) for _ in range(ELEMENTS_COUNT)]
+
+        generic_time = timeit(lambda: [Field.invert(field, element) for element in elements], number=REPEAT)
+        native_time = timeit(lambda: [field.invert(element) for element in elements], number=REPEAT)
+
+        calls = ELEMENTS_COUNT * REPEAT
+        generic_us = generic_time / calls * 1e6
+        native_us = native_time / calls * 1e6
+        print(f'{name:<20} {modulus.bit_length():>5} {generic_us:>18.2f} {native_us:>20.2f} {generic_us / native_us:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import glob
+import json
+import os.path
+import platform
+import random
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from timeit import Timer
+from typing import Callable
+from typing import Dict
+from typing import List
+
+import calculator.app as app
+from calculator.elliptic import GF2NotSupersingularCurve
+from calculator.field import Field
+from calculator.field import gf2_field_cls
+from calculator.field import zp_field_cls
+from calculator.irreducible import get_irreducible_polynomial
+from calculator.parser import TASKS_TYPES_MAP
+from calculator.task import FieldType
+from calculator.task import TaskResult
+from calculator.task import TaskRunnerConfig
+from calculator.task import TaskType
+
+
+INPUT_PATTERN = os.path.join('INPUT', '*.txt')
+ELEMENTS_COUNT = 64
+POINTS_COUNT = 16
+THROUGHPUT_TASKS = 2000
+REPEAT = 3
+REGRESSION_THRESHOLD = 0.1
+
+# Операция -> функция, возвращающая время одного вызова в микросекундах
+Benchmarks = Dict[str, Callable[[], float]]
+
+
+def measure(func: Callable[[], None], ops_per_call: int, repeat: int = REPEAT) -> float:
+    timer = Timer(func)
+    # Число вызовов подбирается так, чтобы один замер шел не меньше 0.2 секунды
+    number, _ = timer.autorange()
+    # Минимум по повторам меньше всего зависит от фоновой нагрузки
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / (number * ops_per_call) * 1e6
+
+
+def _build_field(config: TaskRunnerConfig) -> Field[int]:
+    p = config.field_args[0]
+    if config.field_type is FieldType.Z_p:
+        return zp_field_cls(p)(p)
+    if isinstance(p, int):
+        p = get_irreducible_polynomial(power=p)
+    return gf2_field_cls(p.bits)(p.bits)
+
+
+def _random_elements(config: TaskRunnerConfig) -> List[int]:
+    p = config.field_args[0]
+    if config.field_type is FieldType.Z_p:
+        return [random.randrange(1, p) for _ in range(ELEMENTS_COUNT)]
+    bits = config.field_bit_length()
+    return [random.randrange(1, 2 ** bits) for _ in range(ELEMENTS_COUNT)]
+
+
+def _curve_benchmarks(filename: str) -> Benchmarks:
+    with open(filename, 'r') as input_f:
+        lines = input_f.read().splitlines()
+    config = app.parser.parse(input_lines=iter(lines))
+    curve = config.build_runner().curve
+    field = _build_field(config)
+    field_bits = config.field_bit_length()
+
+    base = next(task.points[0] for task in config.task_configs if task.task_type is TaskType.MUL)
+    scalars = [random.getrandbits(field_bits) | 1 for _ in range(POINTS_COUNT)]
+    points = [curve.mul(base, scalar) for scalar in scalars]
+    pairs = list(zip(points, points[1:] + points[:1]))
+    elements = _random_elements(config)
+    element_pairs = list(zip(elements, elements[1:] + elements[:1]))
+
+    header = [line for line in lines if line.strip()[:1].lower() not in TASKS_TYPES_MAP]
+    task_lines = [line for line in lines if line.strip()[:1].lower() in TASKS_TYPES_MAP]
+    throughput_lines = header + [task_lines[i % len(task_lines)] for i in range(THROUGHPUT_TASKS)]
+    parsed_tasks = app.parser.parse(input_lines=iter(throughput_lines)).task_configs
+    results = [TaskResult(task, task.points[0]) for task in parsed_tasks]
+
+    benchmarks = {
+        'field_mul': lambda: measure(lambda: [field.mul(a, b) for a, b in element_pairs], len(element_pairs)),
+        'field_invert': lambda: measure(lambda: [field.invert(a) for a in elements], len(elements)),
+        'add': lambda: measure(lambda: [curve.add(p, q) for p, q in pairs], len(pairs)),
+        'double': lambda: measure(lambda: [curve.add(p, p) for p in points], len(points)),
+        'mul': lambda: measure(lambda: [curve.mul(p, k) for p, k in zip(points, scalars)], len(points)),
+        'parse': lambda: measure(lambda: app.parser.parse(input_lines=iter(throughput_lines)), THROUGHPUT_TASKS),
+        'format': lambda: measure(lambda: [app.task_result_formatter.format(r) for r in results], len(results)),
+    }
+    if isinstance(curve, GF2NotSupersingularCurve):
+        benchmarks['mul_ladder'] = lambda: measure(
+            lambda: [curve.mul(p, k, ladder=True) for p, k in zip(points, scalars)], len(points),
+        )
+    return benchmarks
+
+
+def run_suite(pattern: str, only: List[str]) -> Dict[str, Dict[str, float]]:
+    app.init_worker()
+    results = {}
+    for filename in sorted(glob.glob(pattern)):
+        name = os.path.basename(filename)
+        random.seed(0)
+        results[name] = {}
+        for operation, benchmark in _curve_benchmarks(filename).items():
+            if only and operation not in only:
+                continue
+            results[name][operation] = benchmark()
+            print(f'{name:<28} {operation:<14} {results[name][operation]:>12.2f} мкс', flush=True)
+    return results
+
+
+def compare(old: Dict[str, Dict[str, float]], new: Dict[str, Dict[str, float]], threshold: float) -> int:
+    regressions = 0
+    print(f'{"файл":<28} {"операция":<14} {"было, мкс":>12} {"стало, мкс":>12} {"изменение":>10}')
+    for name in sorted(old.keys() & new.keys()):
+        for operation in sorted(old[name].keys() & new[name].keys()):
+            before, after = old[name][operation], new[name][operation]
+            change = after / before - 1
+            mark = ''
+            if change > threshold:
+                regressions += 1
+                mark = '  РЕГРЕССИЯ'
+            print(f'{name:<28} {operation:<14} {before:>12.2f} {after:>12.2f} {change:>+9.1%}{mark}')
+    print(f'Регрессий (медленнее более чем на {threshold:.0%}): {regressions}')
+    return regressions
+
+
+def parse_args():
+    arg_parse = ArgumentParser(description='Бенчмарки арифметики полей и кривых на файлах из INPUT.')
+    commands = arg_parse.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Замерить и сохранить результаты в JSON')
+    run_parser.add_argument('-o', '--output', default='benchmark.json', help='Файл для результатов')
+    run_parser.add_argument('-i', '--input', default=INPUT_PATTERN, help='Шаблон входных файлов')
+    run_parser.add_argument('--only', nargs='*', default=[], help='Замерять только указанные операции')
+
+    compare_parser = commands.add_parser('compare', help='Сравнить два JSON с результатами')
+    compare_parser.add_argument('old', help='Базовые результаты')
+    compare_parser.add_argument('new', help='Новые результаты')
+    compare_parser.add_argument('-t', '--threshold', type=float, default=REGRESSION_THRESHOLD,
+                                help='Допустимое замедление (доля), больше - регрессия')
+    return arg_parse.parse_args()
+
+
+def main():
+    options = parse_args()
+
+    if options.command == 'run':
+        report = {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': run_suite(options.input, options.only),
+        }
+        with open(options.output, 'w') as output_f:
+            json.dump(report, output_f, indent=2, ensure_ascii=False)
+        return
+
+    with open(options.old, 'r') as old_f, open(options.new, 'r') as new_f:
+        old, new = json.load(old_f)['results'], json.load(new_f)['results']
+    if compare(old, new, options.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
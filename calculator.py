@@ -7,12 +7,22 @@ def parse_args():
     arg_parse = ArgumentParser(description='Скрипт для сложения точек эллиптической кривой.')
     arg_parse.add_argument('-i', '--input', default='INPUT', help='Входная директория')
     arg_parse.add_argument('-o', '--output', default='OUTPUT', help='Выходная директория')
+    arg_parse.add_argument('-j', '--jobs', type=int, default=None,
+                           help='Число процессов-воркеров (по умолчанию - число ядер)')
+    arg_parse.add_argument('--split-tasks', action='store_true',
+                           help='Распределять задачи каждого файла между воркерами, а не файлы целиком')
+    arg_parse.add_argument('--report-cost', action='store_true',
+                           help='Вывести прогноз стоимости и фактическое время счета каждого файла')
+    arg_parse.add_argument('--profile', action='store_true',
+                           help='Считать операции в поле и время каждой задачи, отчет - <файл>.profile.csv рядом с выводом')
     return arg_parse.parse_args()
 
 
 def main():
     options = parse_args()
-    run_on_directory(input=options.input, output=options.output)
+    run_on_directory(input=options.input, output=options.output, jobs=options.jobs,
+                     split_tasks=options.split_tasks, report_cost=options.report_cost,
+                     profile=options.profile)
 
 
 if __name__ == '__main__':
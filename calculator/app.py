@@ -1,8 +1,18 @@
+import csv
 import glob
+import logging
 import os.path
+import time
+from concurrent.futures import Executor
 from concurrent.futures import Future
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
 
+from calculator.elliptic import Curve
+from calculator.field import Field
 from calculator.output import FormattersRegistry
 from calculator.output import IntFormatter
 from calculator.output import PointFormatter
@@ -10,49 +20,135 @@ from calculator.output import PolynomialFormatter
 from calculator.output import TaskConfigFormatter
 from calculator.output import TaskResultFormatter
 from calculator.parser import Parser
+from calculator.scheduler import format_cost_report
+from calculator.scheduler import schedule_files
+from calculator.task import TaskProfile
+from calculator.task import TaskResult
+from calculator.task import TaskType
 
-parser = Parser()
-registry = FormattersRegistry()
-int_formatter = IntFormatter()
-polynomial_formatter = PolynomialFormatter(int_formatter)
-point_formatter = PointFormatter(registry)
-task_config_formatter = TaskConfigFormatter(point_formatter, int_formatter)
-task_result_config = TaskResultFormatter(task_config_formatter, point_formatter)
+logger = logging.getLogger(__name__)
 
-registry.register(int_formatter)
-registry.register(polynomial_formatter)
-registry.register(point_formatter)
-registry.register(task_config_formatter)
-registry.register(task_result_config)
+parser: Optional[Parser] = None
+task_result_formatter: Optional[TaskResultFormatter] = None
 
+PROFILE_SUFFIX = '.profile.csv'
+PROFILE_COUNTERS = [
+    *Curve.INSTRUMENTED_METHODS.values(),
+    *Field.INSTRUMENTED_METHODS.values(),
+]
 
-def _check_error(future: Future):
+
+def init_worker():
+    # Парсер и реестр форматтеров создаются один раз на процесс-воркер
+    global parser, task_result_formatter
+
+    registry = FormattersRegistry()
+    int_formatter = IntFormatter()
+    polynomial_formatter = PolynomialFormatter(int_formatter)
+    point_formatter = PointFormatter(registry)
+    task_config_formatter = TaskConfigFormatter(point_formatter, int_formatter)
+
+    registry.register(int_formatter)
+    registry.register(polynomial_formatter)
+    registry.register(point_formatter)
+    registry.register(task_config_formatter)
+
+    parser = Parser()
+    task_result_formatter = TaskResultFormatter(task_config_formatter, point_formatter)
+    registry.register(task_result_formatter)
+
+
+def _check_error(filename: str, future: Future):
     if future.exception() is not None:
-        item = future.exception()
-        raise RuntimeError(f'Ошибка: {item}')
+        _log_error(filename, future.exception())
+
+
+def _log_error(filename: str, error: BaseException):
+    # Ошибка одного файла не останавливает остальные: у файла просто не будет фактического времени
+    logger.error(f'Ошибка в файле {filename}: {error}')
 
 
-def run(filename: str, output: str):
-    input_f = open(filename, 'r')
-    filename = os.path.basename(filename)
+def run(filename: str, output: str, executor: Optional[Executor] = None, profile: bool = False) -> float:
+    if parser is None:
+        init_worker()
+    started = time.perf_counter()
 
-    config = parser.parse(input_lines=iter(input_f))
-    task_runner = config.build_runner()
+    with open(filename, 'r') as input_f:
+        filename = os.path.basename(filename)
 
-    with open(os.path.join(output, filename), 'w') as output_f:
-        for task_result in task_runner.run(config.task_configs):
-            task_result_str = task_result_config.format(task_result)
-            output_f.write(task_result_str + os.linesep)
+        # Задачи разбираются потоково: результат пишется по мере счета, весь файл в памяти не держится
+        config = parser.parse(input_lines=iter(input_f), streaming=True)
+        task_runner = config.build_runner()
 
+        with open(os.path.join(output, filename), 'w') as output_f:
+            if profile:
+                # Профилирование идет в этом процессе, задачи по воркерам не делятся
+                with open(os.path.join(output, filename + PROFILE_SUFFIX), 'w', newline='') as profile_f:
+                    results = _write_profile(task_runner.run_instrumented(config.task_configs), profile_f)
+                    _write_results(results, output_f)
+            else:
+                _write_results(task_runner.run(config.task_configs, executor=executor), output_f)
 
-def run_on_directory(input: str, output: str):
+    return time.perf_counter() - started
+
+
+def _write_results(task_results: Iterable[TaskResult], output_f):
+    for task_result in task_results:
+        task_result_str = task_result_formatter.format(task_result)
+        output_f.write(task_result_str + os.linesep)
+
+
+def _write_profile(profiled: Iterable[Tuple[Optional[TaskResult], TaskProfile]], profile_f) -> Iterable[TaskResult]:
+    # Строка профиля пишется на каждую задачу, результаты передаются дальше для обычного вывода
+    writer = csv.writer(profile_f)
+    writer.writerow(['task', 'type', 'scalar_bits', 'wall_us', *PROFILE_COUNTERS])
+    task_number = 0
+    for task_result, task_profile in profiled:
+        task = task_profile.task_config
+        if task is None:
+            row = ['precompute', '', '']
+        else:
+            task_number += 1
+            scalar_bits = ''
+            if task.task_type in (TaskType.MUL, TaskType.X_ONLY_MUL):
+                scalar_bits = abs(task.scalar).bit_length()
+            elif task.task_type in (TaskType.LINEAR_COMBINATION, TaskType.MULTI_SCALAR_MUL):
+                scalar_bits = max(abs(scalar).bit_length() for scalar in task.scalars)
+            row = [task_number, task.task_type.name, scalar_bits]
+        counts = [task_profile.counts[counter] for counter in PROFILE_COUNTERS]
+        writer.writerow([*row, round(task_profile.wall_time * 1e6, 1), *counts])
+        if task_result is not None:
+            yield task_result
+
+
+def run_on_directory(input: str, output: str, jobs: Optional[int] = None, split_tasks: bool = False,
+                     report_cost: bool = False, profile: bool = False):
     if not os.path.exists(output):
         try:
             os.mkdir(output)
         except FileNotFoundError:
             return
-    with ThreadPoolExecutor() as executor:
-        pattern = os.path.join(input, '*.txt')
-        for filename in glob.iglob(pattern):
-            future = executor.submit(run, filename, output)
-            future.add_done_callback(_check_error)
+    if parser is None:
+        init_worker()
+    file_jobs = schedule_files(glob.iglob(os.path.join(input, '*.txt')), parser)
+
+    # Вычисления - чистый Python, поэтому файлы считаются в отдельных процессах, а не потоках (GIL)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker) as executor:
+        futures = []
+        for file_job in file_jobs:
+            if split_tasks and not profile:
+                # Файлы идут по очереди, а задачи каждого файла делятся на порции между воркерами
+                try:
+                    file_job.actual_time = run(file_job.filename, output, executor=executor)
+                except Exception as error:
+                    _log_error(file_job.filename, error)
+                continue
+            future = executor.submit(run, file_job.filename, output, profile=profile)
+            future.add_done_callback(partial(_check_error, file_job.filename))
+            futures.append((file_job, future))
+
+    for file_job, future in futures:
+        if future.exception() is None:
+            file_job.actual_time = future.result()
+    if report_cost:
+        print(format_cost_report(file_jobs))
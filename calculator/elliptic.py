@@ -1,20 +1,46 @@
 from abc import ABCMeta
 from abc import abstractmethod
+from collections import Counter
 from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Generic
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
 from calculator.errors import CalculationError
 from calculator.field import Field
-from calculator.field import GF2PolynomialField
-from calculator.field import ZpField
+from calculator.field import gf2_field_cls
+from calculator.field import zp_field_cls
+from calculator.instrumentation import count_calls
+from calculator.point_table import get_point_table
+from calculator.point_table import POINT_TABLE_MAX_ORDER
 from calculator.polynomial import Polynomial
+from calculator.recoding import joint_sparse_form
+from calculator.recoding import tau_mod
+from calculator.recoding import tau_power
+from calculator.recoding import tau_wnaf
+from calculator.recoding import tau_wnaf_representatives
+from calculator.recoding import wnaf
 
 
 T = TypeVar('T')
 
+FIXED_BASE_WINDOW = 4
+WNAF_WINDOWS = (  # (максимальная длина скаляра в битах, ширина окна)
+    (16, 2),
+    (64, 3),
+    (160, 4),
+    (384, 5),
+)
+WNAF_MAX_WINDOW = 6
+PIPPENGER_MIN_TERMS = 96
+PIPPENGER_MAX_WINDOW = 16
+
 
 @dataclass(unsafe_hash=True)
 class Point(Generic[T]):
@@ -29,64 +55,604 @@ class Point(Generic[T]):
         return self.x is None and self.y is None
 
 
+@dataclass
+class ProjectivePoint(Generic[T]):
+    x: T
+    y: T
+    z: T
+
+
+@dataclass
+class FixedBaseTable(Generic[T]):
+    window: int
+    bits: int
+    multiples: List[List[Point[T]]]  # multiples[i][d - 1] = d * 2^(window * i) * P
+
+
+def choose_pippenger_window(terms_count: int, scalar_bits: int) -> int:
+    # Окно c минимизирует (b / c) * (n + 2^(c-1)): сложения в корзины плюс сборка корзин,
+    # знаковые цифры вдвое сокращают число корзин
+    return min(
+        range(1, PIPPENGER_MAX_WINDOW + 1),
+        key=lambda window: -(-(scalar_bits + 1) // window) * (terms_count + (1 << (window - 1))),
+    )
+
+
+@dataclass
+class CurveGroup(Generic[T]):
+    order: int  # n - простой порядок подгруппы
+    cofactor: int  # h = #E / n
+    generator: Optional[Point[T]] = None
+
+
+def choose_wnaf_window(scalar_bits: int) -> int:
+    for max_bits, window in WNAF_WINDOWS:
+        if scalar_bits <= max_bits:
+            return window
+    return WNAF_MAX_WINDOW
+
+
 class Curve(Generic[T], metaclass=ABCMeta):
-    def __init__(self, field_order: T, field_cls: Type[Field[T]]):
-        self._field: Field[T] = field_cls(field_order)
+    INSTRUMENTED_METHODS = {'_batch_add': 'affine_batch_add', '_projective_double': 'point_double',
+                            '_projective_add': 'point_add', '_projective_mixed_add': 'point_mixed_add'}
+
+    def __init__(self, field_order: Any, field_cls: Type[Field[Any]], group: Optional[CurveGroup[T]] = None):
+        self._field: Field[Any] = field_cls(field_order)
+        self._fixed_base_tables: Dict[Point[T], FixedBaseTable[Any]] = {}
+        self._fixed_base_loaders: Dict[Point[T], Callable[[], Optional[FixedBaseTable[Any]]]] = {}
+        self._group = group
+
+    def instrument(self, counts: Counter):
+        # Обертки ставятся на сам экземпляр: другие кривые и неинструментированный счет не замедляются
+        count_calls(self, self.INSTRUMENTED_METHODS, counts)
+        self._field.instrument(counts)
+
+    def field_bit_length(self) -> int:
+        return self._field.bit_length()
+
+    @property
+    def group(self) -> Optional[CurveGroup[T]]:
+        return self._group
 
     def add(self, first_point: Point[T], second_point: Point[T]) -> Point[T]:
-        if first_point.is_infinite():
-            return second_point
-        if second_point.is_infinite():
-            return first_point
-        if first_point.x != second_point.x:
-            k = self._first_case_coefficient(first_point, second_point)
-        elif first_point.x == second_point.x and first_point.y != second_point.y:
+        return self.batch_add([(first_point, second_point)])[0]
+
+    def batch_add(self, pairs: List[Tuple[Point[T], Point[T]]]) -> List[Point[T]]:
+        imported_pairs = [(self._import_point(first), self._import_point(second)) for first, second in pairs]
+        return [self._export_point(point) for point in self._batch_add(imported_pairs)]
+
+    def mul(
+        self,
+        first_point: Point[T],
+        scalar: int,
+        window: Optional[int] = None,
+        ladder: bool = False,
+        recover_y: bool = True,
+    ) -> Point[T]:
+        # ladder - лестница Монтгомери только по x; при recover_y=False результат - Point(x, None)
+        if first_point.is_infinite() or scalar == 0:
             return Point.infinity()
-        else:
-            k = self._third_case_coefficient(first_point, second_point)
-        k = self._field.normalize_element(k)
-        result_point = self._additive_point(first_point, second_point, coefficient=k)
-        result_point.x = self._field.normalize_element(result_point.x)
-        result_point.y = self._field.normalize_element(result_point.y)
-
-        return result_point
-
-    def mul(self, first_point: Point[T], scalar: int) -> Point[T]:
-        result = Point.infinity()
-        addend = first_point
-        while scalar:
-            if scalar & 1:
-                result = self.add(result, addend)
-            addend = self.add(addend, addend)
-            scalar >>= 1
-        return result
+        if scalar < 0:
+            return self.mul(self.neg(first_point), -scalar, window=window, ladder=ladder, recover_y=recover_y)
+
+        # Для точки из подгруппы порядка n скаляр берется по модулю n, а kP при k > n/2 считается как (n - k)(-P)
+        subgroup = self._group is not None and scalar > self._group.order // 2 and self.in_subgroup(first_point)
+        if subgroup:
+            scalar %= self._group.order
+            if scalar == 0:
+                return Point.infinity()
+
+        if ladder:
+            return self._export_point(self._ladder_mul(self._import_point(first_point), scalar, recover_y))
+
+        table = self.fixed_base_table(first_point)
+        if table is not None and scalar.bit_length() <= table.bits:
+            return self._export_point(self._fixed_base_mul(table, scalar))
+
+        if subgroup and scalar > self._group.order // 2:
+            return self.mul(self.neg(first_point), self._group.order - scalar, window=window)
+
+        return self._export_point(self._wnaf_mul(self._import_point(first_point), scalar, window))
+
+    def linear_combination(self, terms: List[Tuple[Point[T], int]]) -> Point[T]:
+        # sum(k_i * P_i) с одной цепочкой удвоений на все слагаемые
+        prepared = self._prepare_terms(terms)
+        if not prepared:
+            return Point.infinity()
+        if len(prepared) == 1:
+            return self.mul(*prepared[0])
+
+        imported = [(self._import_point(point), scalar) for point, scalar in prepared]
+        if len(imported) == 2:
+            return self._export_point(self._jsf_combination(*imported[0], *imported[1]))
+        if len(imported) >= PIPPENGER_MIN_TERMS:
+            return self._export_point(self._pippenger(imported))
+        return self._export_point(self._interleaved_combination(imported))
+
+    def multi_scalar_mul(self, terms: List[Tuple[Point[T], int]]) -> Point[T]:
+        # Пакетное API для больших сумм: всегда метод корзин Пиппенджера
+        prepared = self._prepare_terms(terms)
+        if not prepared:
+            return Point.infinity()
+        return self._export_point(self._pippenger([(self._import_point(point), scalar) for point, scalar in prepared]))
+
+    def neg(self, point: Point[T]) -> Point[T]:
+        return self._export_point(self._neg(self._import_point(point)))
+
+    def is_on_curve(self, point: Point[T]) -> bool:
+        return point.is_infinite() or self._is_on_curve(self._import_point(point))
+
+    def in_subgroup(self, point: Point[T]) -> bool:
+        # Проверка n * P = O стоит полного умножения, поэтому без нее обходятся: при h = 1 подгруппа - вся кривая,
+        # иначе в подгруппе заведомо лежит только образующая
+        if self._group is None:
+            return False
+        if point.is_infinite() or point == self._group.generator:
+            return True
+        return self._group.cofactor == 1 and self.is_on_curve(point)
+
+    def fixed_base_table(self, point: Point[T]) -> Optional[FixedBaseTable[Any]]:
+        # Точки таблицы - во внутреннем представлении кривой
+        table = self._fixed_base_tables.get(point)
+        if table is None and point in self._fixed_base_loaders:
+            table = self._fixed_base_loaders.pop(point)()
+            if table is not None:
+                self._fixed_base_tables[point] = table
+        return table
+
+    def register_fixed_base_table(self, point: Point[T], loader: Callable[[], Optional[FixedBaseTable[Any]]]):
+        # Готовая таблица (например, с диска) загружается только при первом обращении к ней
+        self._fixed_base_loaders[point] = loader
+
+    def precompute(self, point: Point[T], window: int = FIXED_BASE_WINDOW) -> None:
+        if point.is_infinite() or self.fixed_base_table(point) is not None:
+            return
+
+        bits = self._field.bit_length() + 1
+        bases = [self._to_projective(self._import_point(point))]  # 2^(wi) * P
+        for _ in range(window, bits, window):
+            base = bases[-1]
+            for _ in range(window):
+                base = self._projective_double(base)
+            bases.append(base)
+
+        rows = []
+        for base in self._to_affine_batch(bases):
+            row = [self._to_projective(base)]
+            for _ in range(2, 1 << window):
+                row.append(self._projective_mixed_add(row[-1], base))
+            rows.append(row)
+
+        # Все точки таблицы приводятся к аффинному виду одним обращением
+        row_size = (1 << window) - 1
+        affine = self._to_affine_batch([item for row in rows for item in row])
+        multiples = [affine[index:index + row_size] for index in range(0, len(affine), row_size)]
+
+        self._fixed_base_tables[point] = FixedBaseTable(window=window, bits=bits, multiples=multiples)
+
+    # Внутреннее представление элементов поля. Кривые, считающие не в типе T, переопределяют эти методы
+    def _import_point(self, point: Point[T]) -> Point[Any]:
+        return point
+
+    def _export_point(self, point: Point[Any]) -> Point[T]:
+        return point
+
+    def _reduce_point(self, point: Point[Any]) -> Point[Any]:
+        if point.is_infinite():
+            return point
+        return Point(self._field.modulus(point.x), self._field.modulus(point.y))
+
+    def _batch_add(self, pairs: List[Tuple[Point[Any], Point[Any]]]) -> List[Point[Any]]:
+        # Знаменатели всех коэффициентов k обращаются разом (трюк Монтгомери)
+        # Координаты приводятся до сравнения: (x + p, y) и (x, y) - одна и та же точка
+        pairs = [(self._reduce_point(first), self._reduce_point(second)) for first, second in pairs]
+        results: List[Optional[Point[Any]]] = []
+        fractions = []
+        for index, (first_point, second_point) in enumerate(pairs):
+            if first_point.is_infinite():
+                results.append(second_point)
+            elif second_point.is_infinite():
+                results.append(first_point)
+            elif first_point.x != second_point.x:
+                results.append(None)
+                fractions.append((index, *self._first_case_fraction(first_point, second_point)))
+            elif first_point.y != second_point.y:
+                results.append(Point.infinity())
+            else:
+                results.append(None)
+                fractions.append((index, *self._third_case_fraction(first_point, second_point)))
+
+        denominators = [self._field.modulus(denominator) for _, _, denominator in fractions]
+        inverses = self._field.batch_invert(denominators)
+        for (index, numerator, _), denominator, inverse in zip(fractions, denominators, inverses):
+            if denominator == self._field.zero():  # P = -P, т.е. 2P = O
+                results[index] = Point.infinity()
+                continue
+
+            first_point, second_point = pairs[index]
+            k = self._field.normalize_element(self._field.mul(numerator, inverse))
+            result_point = self._additive_point(first_point, second_point, coefficient=k)
+            result_point.x = self._field.normalize_element(result_point.x)
+            result_point.y = self._field.normalize_element(result_point.y)
+            results[index] = result_point
+
+        return results
+
+    def _wnaf_mul(self, first_point: Point[Any], scalar: int, window: Optional[int] = None) -> Point[Any]:
+        if window is None:
+            window = choose_wnaf_window(scalar.bit_length())
+
+        # Нечетные кратные P, 3P, ..., (2^(w-1) - 1)P и их отрицания
+        odd_multiples = self._odd_multiples(first_point, count=1 << (window - 2))
+        negated_multiples = [self._neg(point) for point in odd_multiples]
+
+        digits = wnaf(scalar, window)
+        result = self._to_projective(odd_multiples[digits[-1] >> 1])
+        for digit in reversed(digits[:-1]):
+            result = self._projective_double(result)
+            if digit > 0:
+                result = self._projective_mixed_add(result, odd_multiples[digit >> 1])
+            elif digit < 0:
+                result = self._projective_mixed_add(result, negated_multiples[-digit >> 1])
+        return self._to_affine(result)
+
+    def _prepare_terms(self, terms: List[Tuple[Point[T], int]]) -> List[Tuple[Point[T], int]]:
+        # Слагаемые с O и нулевым коэффициентом отбрасываются, коэффициенты делаются положительными
+        prepared = []
+        for point, scalar in terms:
+            if point.is_infinite():
+                continue
+            if scalar < 0:
+                point, scalar = self.neg(point), -scalar
+            if self._group is not None and scalar >= self._group.order and self.in_subgroup(point):
+                scalar %= self._group.order
+            if scalar:
+                prepared.append((point, scalar))
+        return prepared
+
+    def _jsf_combination(
+        self,
+        first_point: Point[Any],
+        first_scalar: int,
+        second_point: Point[Any],
+        second_scalar: int,
+    ) -> Point[Any]:
+        # Метод Шамира: на столбец цифр JSF одно удвоение и не больше одного сложения с P, Q, P + Q или P - Q
+        first_projective = self._to_projective(first_point)
+        sum_point, difference_point = self._to_affine_batch([
+            self._projective_mixed_add(first_projective, second_point),
+            self._projective_mixed_add(first_projective, self._neg(second_point)),
+        ])
+        table = {(1, 0): first_point, (0, 1): second_point, (1, 1): sum_point, (1, -1): difference_point}
+        for (first_digit, second_digit), point in list(table.items()):
+            table[(-first_digit, -second_digit)] = self._neg(point)
+
+        digits = joint_sparse_form(first_scalar, second_scalar)
+        result = self._to_projective(table[digits[-1]])
+        for column in reversed(digits[:-1]):
+            result = self._projective_double(result)
+            if column != (0, 0):
+                result = self._projective_mixed_add(result, table[column])
+        return self._to_affine(result)
+
+    def _interleaved_combination(self, terms: List[Tuple[Point[Any], int]]) -> Point[Any]:
+        # Чередующиеся w-NAF (метод Штрауса): у каждого слагаемого своя таблица нечетных кратных, удвоения общие
+        windows = [choose_wnaf_window(scalar.bit_length()) for _, scalar in terms]
+        requests = [(point, 1 << (window - 2)) for (point, _), window in zip(terms, windows)]
+        odd_multiples = self._odd_multiples_batch(requests)
+        negated_multiples = [[self._neg(point) for point in multiples] for multiples in odd_multiples]
+        digits = [wnaf(scalar, window) for (_, scalar), window in zip(terms, windows)]
+
+        result = self._to_projective(Point.infinity())
+        for index in range(max(map(len, digits)) - 1, -1, -1):
+            result = self._projective_double(result)
+            for term_digits, multiples, negated in zip(digits, odd_multiples, negated_multiples):
+                digit = term_digits[index] if index < len(term_digits) else 0
+                if digit > 0:
+                    result = self._projective_mixed_add(result, multiples[digit >> 1])
+                elif digit < 0:
+                    result = self._projective_mixed_add(result, negated[-digit >> 1])
+        return self._to_affine(result)
+
+    def _pippenger(self, terms: List[Tuple[Point[Any], int]]) -> Point[Any]:
+        # Метод корзин: коэффициенты режутся на знаковые цифры по c бит, в каждом окне точки раскладываются
+        # по корзинам |цифры| (для отрицательной цифры - -P), а сумма d * B_d собирается двумя проходами
+        # нарастающих сумм. На окно n + 2^c сложений вместо n умножений, удвоения общие - c на окно
+        window = choose_pippenger_window(len(terms), max(scalar.bit_length() for _, scalar in terms))
+        base = 1 << window
+        half = base >> 1
+
+        digits = []
+        for _, scalar in terms:
+            term_digits = []
+            while scalar:
+                digit = scalar & (base - 1)
+                scalar >>= window
+                if digit > half:
+                    digit -= base
+                    scalar += 1
+                term_digits.append(digit)
+            digits.append(term_digits)
+        negated = [self._neg(point) for point, _ in terms]
+
+        infinity = self._to_projective(Point.infinity())
+        result = infinity
+        for index in range(max(map(len, digits)) - 1, -1, -1):
+            for _ in range(window):
+                result = self._projective_double(result)
+
+            buckets = [None] * (half + 1)
+            for (point, _), negated_point, term_digits in zip(terms, negated, digits):
+                digit = term_digits[index] if index < len(term_digits) else 0
+                if digit == 0:
+                    continue
+                addend = point if digit > 0 else negated_point
+                bucket = buckets[abs(digit)]
+                if bucket is None:
+                    buckets[abs(digit)] = self._to_projective(addend)
+                else:
+                    buckets[abs(digit)] = self._projective_mixed_add(bucket, addend)
+
+            # sum(d * B_d) = B_half + (B_half + B_(half-1)) + ... : нарастающая сумма корзин сверху вниз
+            running = window_sum = infinity
+            for bucket in reversed(buckets[1:]):
+                if bucket is not None:
+                    running = self._projective_add(running, bucket)
+                window_sum = self._projective_add(window_sum, running)
+            result = self._projective_add(result, window_sum)
+        return self._to_affine(result)
+
+    def _ladder_mul(self, point: Point[Any], scalar: int, recover_y: bool) -> Point[Any]:
+        raise ValueError('Лестница Монтгомери поддерживается только для несуперсингулярных кривых над GF(2^m)')
 
     @abstractmethod
-    def _first_case_coefficient(self, first_point: Point[T], second_point: Point[T]) -> T:
+    def _is_on_curve(self, point: Point[Any]) -> bool:
         raise NotImplementedError
 
     @abstractmethod
-    def _third_case_coefficient(self, first_point: Point[T], second_point: Point[T]) -> T:
+    def _neg(self, point: Point[Any]) -> Point[Any]:
         raise NotImplementedError
 
+    def _fixed_base_mul(self, table: FixedBaseTable[Any], scalar: int) -> Point[Any]:
+        # k * P = sum(d_i * 2^(wi) * P), где d_i - w-битные цифры k: только сложения, без удвоений
+        mask = (1 << table.window) - 1
+        result = self._to_projective(Point.infinity())
+        for row in table.multiples:
+            digit = scalar & mask
+            if digit:
+                result = self._projective_mixed_add(result, row[digit - 1])
+            scalar >>= table.window
+        return self._to_affine(result)
+
+    def _odd_multiples(self, point: Point[Any], count: int) -> List[Point[Any]]:
+        return self._odd_multiples_batch([(point, count)])[0]
+
+    def _odd_multiples_batch(self, requests: List[Tuple[Point[Any], int]]) -> List[List[Point[Any]]]:
+        # Нечетные кратные P, 3P, ..., (2count - 1)P для нескольких точек, к аффинному виду - одним обращением
+        projective = []
+        for point, count in requests:
+            if count == 1:
+                continue
+            double_point = self._projective_double(self._to_projective(point))
+            multiples = [self._to_projective(point)]
+            for _ in range(1, count):
+                multiples.append(self._projective_add(multiples[-1], double_point))
+            projective.extend(multiples)
+
+        affine = iter(self._to_affine_batch(projective) if projective else [])
+        return [[point] if count == 1 else [next(affine) for _ in range(count)] for point, count in requests]
+
+    # Внутреннее представление точек для умножения. По умолчанию это аффинные точки,
+    # кривые с проективными координатами переопределяют эти методы
+    def _to_projective(self, point: Point[Any]) -> Any:
+        return point
+
+    def _to_affine(self, point: Any) -> Point[Any]:
+        return point
+
+    def _to_affine_batch(self, points: List[Any]) -> List[Point[Any]]:
+        return [self._to_affine(point) for point in points]
+
+    def _projective_double(self, point: Any) -> Any:
+        return self._batch_add([(point, point)])[0]
+
+    def _projective_add(self, first_point: Any, second_point: Any) -> Any:
+        return self._batch_add([(first_point, second_point)])[0]
+
+    def _projective_mixed_add(self, first_point: Any, second_point: Point[Any]) -> Any:
+        return self._batch_add([(first_point, second_point)])[0]
+
+    # Коэффициент k = числитель / знаменатель для сложения разных точек и для удвоения
     @abstractmethod
-    def _additive_point(self, first_point: Point[T], second_point: Point[T], coefficient: T) -> Point[T]:
+    def _first_case_fraction(self, first_point: Point[Any], second_point: Point[Any]) -> Tuple[Any, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _third_case_fraction(self, first_point: Point[Any], second_point: Point[Any]) -> Tuple[Any, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _additive_point(self, first_point: Point[Any], second_point: Point[Any], coefficient: Any) -> Point[Any]:
         raise NotImplementedError
 
 
 class ZpCurve(Curve[int]):
-    def __init__(self, p: int, a: int, b: int):
+    def __init__(self, p: int, a: int, b: int, group: Optional[CurveGroup[int]] = None):
+        self._p = p
         self._a = a
         self._b = b
-        super().__init__(p, field_cls=ZpField)
+        super().__init__(p, field_cls=zp_field_cls(p), group=group)
+        self._a_is_minus_3 = self._field.modulus(a + 3) == 0
+        # Для малых p с циклической группой точек сложение и умножение сводятся к арифметике индексов i * G,
+        # таблица запрашивается при операциях и появляется, когда их набирается достаточно
+        self._point_table = None
+
+    def batch_add(self, pairs: List[Tuple[Point[int], Point[int]]]) -> List[Point[int]]:
+        indices = self._table_indices([point for pair in pairs for point in pair])
+        if indices is None:
+            return super().batch_add(pairs)
+        return [self._table_point(first + second) for first, second in zip(indices[::2], indices[1::2])]
+
+    def mul(
+        self,
+        first_point: Point[int],
+        scalar: int,
+        window: Optional[int] = None,
+        ladder: bool = False,
+        recover_y: bool = True,
+    ) -> Point[int]:
+        indices = None if ladder else self._table_indices([first_point])
+        if indices is None:
+            return super().mul(first_point, scalar, window=window, ladder=ladder, recover_y=recover_y)
+        return self._table_point(indices[0] * scalar)
+
+    def linear_combination(self, terms: List[Tuple[Point[int], int]]) -> Point[int]:
+        indices = self._table_indices([point for point, _ in terms])
+        if indices is None:
+            return super().linear_combination(terms)
+        return self._table_point(sum(index * scalar for index, (_, scalar) in zip(indices, terms)))
+
+    def multi_scalar_mul(self, terms: List[Tuple[Point[int], int]]) -> Point[int]:
+        indices = self._table_indices([point for point, _ in terms])
+        if indices is None:
+            return super().multi_scalar_mul(terms)
+        return self._table_point(sum(index * scalar for index, (_, scalar) in zip(indices, terms)))
+
+    def _table_indices(self, points: List[Point[int]]) -> Optional[List[int]]:
+        # None - таблицы нет или какая-то точка не из нее (не на кривой): тогда считается обычным способом
+        if self._point_table is None:
+            if self._p > POINT_TABLE_MAX_ORDER:
+                return None
+            self._point_table = get_point_table(self._p, self._a, self._b, operations=len(points))
+            if self._point_table is None:
+                return None
+        indices = []
+        for point in points:
+            index = 0 if point.is_infinite() else self._point_table.index(point.x, point.y)
+            if index is None:
+                return None
+            indices.append(index)
+        return indices
+
+    def _table_point(self, index: int) -> Point[int]:
+        point = self._point_table.point(index)
+        return Point.infinity() if point is None else Point(*point)
 
-    def _first_case_coefficient(self, first_point: Point[int], second_point: Point[int]) -> int:
-        return self._field.modulus((second_point.y - first_point.y) *
-                                   self._field.invert(second_point.x - first_point.x))  # k = (y2 - y1) / (x2 - x1)
+    def _neg(self, point: Point[int]) -> Point[int]:
+        if point.is_infinite():
+            return point
+        return Point(point.x, self._field.modulus(-point.y))  # -(x, y) = (x, -y)
 
-    def _third_case_coefficient(self, first_point: Point[int], second_point: Point[int]) -> int:
-        return self._field.modulus((3 * first_point.x ** 2 + self._a) *
-                                   self._field.invert(2 * first_point.y))  # k = (3(x1)^2+a) / (2y1)
+    def _is_on_curve(self, point: Point[int]) -> bool:
+        x, y = point.x, point.y
+        return self._field.modulus(y * y - x * x * x - self._a * x - self._b) == 0  # y^2 = x^3 + ax + b
+
+    # Якобиевы координаты: (X : Y : Z) соответствует аффинной точке (X/Z^2, Y/Z^3), Z = 0 - точка O
+    def _to_projective(self, point: Point[int]) -> ProjectivePoint[int]:
+        if point.is_infinite():
+            return ProjectivePoint(1, 1, 0)
+        return ProjectivePoint(self._field.modulus(point.x), self._field.modulus(point.y), 1)
+
+    def _to_affine(self, point: ProjectivePoint[int]) -> Point[int]:
+        if point.z == 0:
+            return Point.infinity()
+        return self._scale_to_affine(point, self._field.invert(point.z))
+
+    def _to_affine_batch(self, points: List[ProjectivePoint[int]]) -> List[Point[int]]:
+        z_inverses = self._field.batch_invert([point.z for point in points])
+        return [self._scale_to_affine(point, z_inv) for point, z_inv in zip(points, z_inverses)]
+
+    def _scale_to_affine(self, point: ProjectivePoint[int], z_inv: int) -> Point[int]:
+        if point.z == 0:
+            return Point.infinity()
+        z_inv_2 = self._field.modulus(z_inv * z_inv)
+        x = self._field.modulus(point.x * z_inv_2)  # x = X / Z^2
+        y = self._field.modulus(point.y * z_inv_2 * z_inv)  # y = Y / Z^3
+        return Point(x, y)
+
+    def _projective_double(self, point: ProjectivePoint[int]) -> ProjectivePoint[int]:
+        if point.z == 0 or point.y == 0:
+            return ProjectivePoint(1, 1, 0)
+
+        modulus = self._field.modulus
+        yy = modulus(point.y * point.y)
+        zz = modulus(point.z * point.z)
+        if self._a_is_minus_3:
+            m = modulus(3 * (point.x - zz) * (point.x + zz))  # M = 3(X - Z^2)(X + Z^2)
+        else:
+            m = modulus(3 * point.x * point.x + self._a * zz * zz)  # M = 3X^2 + aZ^4
+        s = modulus(4 * point.x * yy)  # S = 4XY^2
+        x3 = modulus(m * m - 2 * s)  # X3 = M^2 - 2S
+        y3 = modulus(m * (s - x3) - 8 * yy * yy)  # Y3 = M(S - X3) - 8Y^4
+        z3 = modulus(2 * point.y * point.z)  # Z3 = 2YZ
+        return ProjectivePoint(x3, y3, z3)
+
+    def _projective_add(
+        self,
+        first_point: ProjectivePoint[int],
+        second_point: ProjectivePoint[int],
+    ) -> ProjectivePoint[int]:
+        if second_point.z == 0:
+            return first_point
+        if first_point.z == 0:
+            return second_point
+
+        modulus = self._field.modulus
+        z1z1 = modulus(first_point.z * first_point.z)
+        z2z2 = modulus(second_point.z * second_point.z)
+        u1 = modulus(first_point.x * z2z2)  # U1 = X1 * Z2^2
+        u2 = modulus(second_point.x * z1z1)  # U2 = X2 * Z1^2
+        s1 = modulus(first_point.y * second_point.z * z2z2)  # S1 = Y1 * Z2^3
+        s2 = modulus(second_point.y * first_point.z * z1z1)  # S2 = Y2 * Z1^3
+        h = modulus(u2 - u1)  # H = U2 - U1
+        r = modulus(s2 - s1)  # r = S2 - S1
+        if h == 0:
+            if r == 0:
+                return self._projective_double(first_point)
+            return ProjectivePoint(1, 1, 0)
+
+        hh = modulus(h * h)
+        hhh = modulus(h * hh)
+        v = modulus(u1 * hh)  # V = U1 * H^2
+        x3 = modulus(r * r - hhh - 2 * v)  # X3 = r^2 - H^3 - 2V
+        y3 = modulus(r * (v - x3) - s1 * hhh)  # Y3 = r(V - X3) - S1 * H^3
+        z3 = modulus(first_point.z * second_point.z * h)  # Z3 = Z1 * Z2 * H
+        return ProjectivePoint(x3, y3, z3)
+
+    def _projective_mixed_add(
+        self,
+        first_point: ProjectivePoint[int],
+        second_point: Point[int],
+    ) -> ProjectivePoint[int]:
+        if second_point.is_infinite():
+            return first_point
+        if first_point.z == 0:
+            return self._to_projective(second_point)
+
+        modulus = self._field.modulus
+        zz = modulus(first_point.z * first_point.z)
+        u2 = modulus(second_point.x * zz)  # U2 = x2 * Z1^2
+        s2 = modulus(second_point.y * zz * first_point.z)  # S2 = y2 * Z1^3
+        h = modulus(u2 - first_point.x)  # H = U2 - X1
+        r = modulus(s2 - first_point.y)  # r = S2 - Y1
+        if h == 0:
+            if r == 0:
+                return self._projective_double(first_point)
+            return ProjectivePoint(1, 1, 0)
+
+        hh = modulus(h * h)
+        hhh = modulus(h * hh)
+        v = modulus(first_point.x * hh)  # V = X1 * H^2
+        x3 = modulus(r * r - hhh - 2 * v)  # X3 = r^2 - H^3 - 2V
+        y3 = modulus(r * (v - x3) - first_point.y * hhh)  # Y3 = r(V - X3) - Y1 * H^3
+        z3 = modulus(first_point.z * h)  # Z3 = Z1 * H
+        return ProjectivePoint(x3, y3, z3)
+
+    def _first_case_fraction(self, first_point: Point[int], second_point: Point[int]) -> Tuple[int, int]:
+        return second_point.y - first_point.y, second_point.x - first_point.x  # k = (y2 - y1) / (x2 - x1)
+
+    def _third_case_fraction(self, first_point: Point[int], second_point: Point[int]) -> Tuple[int, int]:
+        return 3 * first_point.x ** 2 + self._a, 2 * first_point.y  # k = (3(x1)^2+a) / (2y1)
 
     def _additive_point(self, first_point: Point[int], second_point: Point[int], coefficient: int) -> Point[int]:
         x3 = self._field.modulus(coefficient ** 2 - first_point.x - second_point.x)  # x3 = k^2 - x1 - x2
@@ -95,52 +661,369 @@ class ZpCurve(Curve[int]):
 
 
 class GF2CurveBase(Curve[Polynomial], metaclass=ABCMeta):
-    def __init__(self, p: Polynomial, a: Polynomial, b: Polynomial, c: Polynomial):
-        self._a = a
-        self._b = b
-        self._c = c
-        super().__init__(field_order=p, field_cls=GF2PolynomialField)
+    # Внутри кривой элементы GF(2^m) хранятся как int, Polynomial - только на входе и выходе
+    def __init__(
+        self,
+        p: Polynomial,
+        a: Polynomial,
+        b: Polynomial,
+        c: Polynomial,
+        group: Optional[CurveGroup[Polynomial]] = None,
+    ):
+        super().__init__(field_order=p.bits, field_cls=gf2_field_cls(p.bits), group=group)
+        self._a = self._field.modulus(a.bits)
+        self._b = self._field.modulus(b.bits)
+        self._c = self._field.modulus(c.bits)
+
+    def _import_point(self, point: Point[Polynomial]) -> Point[int]:
+        if point.is_infinite():
+            return Point.infinity()
+        return Point(self._field.modulus(point.x.bits), self._field.modulus(point.y.bits))
+
+    def _export_point(self, point: Point[int]) -> Point[Polynomial]:
+        if point.is_infinite():
+            return Point.infinity()
+        if point.y is None:
+            return Point(Polynomial(point.x), None)
+        return Point(Polynomial(point.x), Polynomial(point.y))
+
+    # Координаты Лопеса-Дахаба: (X : Y : Z) соответствует аффинной точке (X/Z, Y/Z^2), Z = 0 - точка O
+    def _to_projective(self, point: Point[int]) -> ProjectivePoint[int]:
+        if point.is_infinite():
+            return ProjectivePoint(1, 0, 0)
+        return ProjectivePoint(self._field.modulus(point.x), self._field.modulus(point.y), 1)
+
+    def _to_affine(self, point: ProjectivePoint[int]) -> Point[int]:
+        if point.z == 0:
+            return Point.infinity()
+        return self._scale_to_affine(point, self._field.invert(point.z))
+
+    def _to_affine_batch(self, points: List[ProjectivePoint[int]]) -> List[Point[int]]:
+        z_inverses = self._field.batch_invert([point.z for point in points])
+        return [self._scale_to_affine(point, z_inv) for point, z_inv in zip(points, z_inverses)]
+
+    def _scale_to_affine(self, point: ProjectivePoint[int], z_inv: int) -> Point[int]:
+        if point.z == 0:
+            return Point.infinity()
+        x = self._field.mul(point.x, z_inv)  # x = X / Z
+        y = self._field.mul(point.y, self._field.square(z_inv))  # y = Y / Z^2
+        return Point(x, y)
 
 
 class GF2NotSupersingularCurve(GF2CurveBase):  # NSS2
-    def _first_case_coefficient(self, first_point: Point[Polynomial], second_point: Point[Polynomial]) -> Polynomial:
-        return self._field.modulus((first_point.y + second_point.y) *
-                                   self._field.invert(first_point.x + second_point.x))  # k = (y1 + y2) / (x1 + x2)
+    def _neg(self, point: Point[int]) -> Point[int]:
+        if point.is_infinite():
+            return point
+        return Point(point.x, point.y ^ self._field.mul(self._a, point.x))  # -(x, y) = (x, y + ax)
 
-    def _third_case_coefficient(self, first_point: Point[Polynomial], second_point: Point[Polynomial]) -> Polynomial:
-        return self._field.modulus((first_point.x * first_point.x + self._a * first_point.y) *
-                                   self._field.invert((self._a * first_point.x)))  # k = ((x1)^2 + ay1) / ax1
+    def _is_on_curve(self, point: Point[int]) -> bool:
+        mul, square = self._field.mul, self._field.square
+        x, y = point.x, point.y
+        xx = square(x)
+        # y^2 + axy = x^3 + bx^2 + c
+        return square(y) ^ mul(mul(self._a, x), y) ^ mul(xx, x) ^ mul(self._b, xx) ^ self._c == 0
 
-    def _additive_point(
+    def _projective_double(self, point: ProjectivePoint[int]) -> ProjectivePoint[int]:
+        if point.z == 0 or point.x == 0:
+            return ProjectivePoint(1, 0, 0)
+
+        mul, square = self._field.mul, self._field.square
+        xx = square(point.x)
+        zz = square(point.z)
+        t = mul(self._a, mul(point.x, point.z))  # T = aXZ
+        z3 = square(t)  # Z3 = (aXZ)^2
+        x3 = square(xx) ^ mul(mul(square(self._a), self._c), square(zz))  # X3 = X^4 + a^2cZ^4
+        # Y3 = aX^4 * Z3 + T * X3 * (X^2 + aY + aT)
+        y3 = mul(mul(self._a, square(xx)), z3) ^ mul(mul(t, x3), xx ^ mul(self._a, point.y ^ t))
+        return ProjectivePoint(x3, y3, z3)
+
+    def _projective_add(
         self,
-        first_point: Point[Polynomial],
-        second_point: Point[Polynomial],
-        coefficient: Polynomial,
-    ) -> Point[Polynomial]:
-        x3 = self._field.modulus(coefficient * coefficient + self._a * coefficient + self._b + first_point.x +
-                                 second_point.x)  # x3 = k*2 + ak + b + x1 + x2
-        y3 = self._field.modulus(first_point.y + coefficient * (x3 + first_point.x))  # y3 = kx3+d = k(x3+x1) + y1
+        first_point: ProjectivePoint[int],
+        second_point: ProjectivePoint[int],
+    ) -> ProjectivePoint[int]:
+        if second_point.z == 0:
+            return first_point
+        if first_point.z == 0:
+            return second_point
+
+        mul, square = self._field.mul, self._field.square
+        # A = Y1Z2^2 + Y2Z1^2
+        aa = mul(first_point.y, square(second_point.z)) ^ mul(second_point.y, square(first_point.z))
+        bb = mul(first_point.x, second_point.z) ^ mul(second_point.x, first_point.z)  # B = X1Z2 + X2Z1
+        if bb == 0:
+            if aa == 0:
+                return self._projective_double(first_point)
+            return ProjectivePoint(1, 0, 0)
 
-        return Point(x3, self._field.modulus(self._a * x3 + y3))
+        e = mul(first_point.z, bb)  # E = Z1 * B
+        c = mul(e, second_point.z)  # C = Z1 * Z2 * B
+        z3 = square(c)  # Z3 = C^2
+        x3 = square(aa) ^ mul(c, mul(self._a, aa) ^ mul(self._b, c) ^ square(bb))  # X3 = A^2 + C(aA + bC + B^2)
+        # Y3 = (A + aC) * C * X3 + Z3 * E * (A * X2 + E * Y2)
+        y3 = (mul(mul(aa ^ mul(self._a, c), c), x3) ^
+              mul(mul(z3, e), mul(aa, second_point.x) ^ mul(e, second_point.y)))
+        return ProjectivePoint(x3, y3, z3)
+
+    def _projective_mixed_add(
+        self,
+        first_point: ProjectivePoint[int],
+        second_point: Point[int],
+    ) -> ProjectivePoint[int]:
+        if second_point.is_infinite():
+            return first_point
+        if first_point.z == 0:
+            return self._to_projective(second_point)
+
+        mul, square = self._field.mul, self._field.square
+        aa = first_point.y ^ mul(second_point.y, square(first_point.z))  # A = Y1 + y2 * Z1^2
+        bb = first_point.x ^ mul(second_point.x, first_point.z)  # B = X1 + x2 * Z1
+        if bb == 0:
+            if aa == 0:
+                return self._projective_double(self._to_projective(second_point))
+            return ProjectivePoint(1, 0, 0)
+
+        c = mul(first_point.z, bb)  # C = Z1 * B
+        z3 = square(c)  # Z3 = C^2
+        x3 = square(aa) ^ mul(c, mul(self._a, aa) ^ mul(self._b, c) ^ square(bb))  # X3 = A^2 + C(aA + bC + B^2)
+        f = x3 ^ mul(second_point.x, z3)  # F = X3 + x2 * Z3
+        g = mul(mul(self._a, second_point.x) ^ second_point.y, square(z3))  # G = (ax2 + y2) * Z3^2
+        y3 = mul(mul(aa, c) ^ mul(self._a, z3), f) ^ g  # Y3 = (AC + aZ3)F + G
+        return ProjectivePoint(x3, y3, z3)
+
+    def _ladder_mul(self, point: Point[int], scalar: int, recover_y: bool) -> Point[int]:
+        # Лестница Монтгомери (Лопес-Дахаб): хранятся только (X : Z) для R0 = kP и R1 = (k + 1)P, их разность
+        # всегда P, поэтому на бит - одно сложение и одно удвоение по x: 6 умножений, 5 квадратов, без обращений
+        if point.x == 0:
+            if not scalar & 1:
+                return Point.infinity()
+            return point if recover_y else Point(point.x, None)  # точка порядка 2
+
+        mul, square = self._field.mul, self._field.square
+        a2 = square(self._a)
+        a2c = mul(a2, self._c)
+        x = point.x
+
+        def double(x1: int, z1: int) -> Tuple[int, int]:
+            xx, zz = square(x1), square(z1)
+            return square(xx) ^ mul(a2c, square(zz)), mul(a2, mul(xx, zz))  # X^4 + a^2cZ^4, a^2X^2Z^2
+
+        def add(x1: int, z1: int, x2: int, z2: int) -> Tuple[int, int]:
+            t1, t2 = mul(x1, z2), mul(x2, z1)
+            z3 = square(t1 ^ t2)  # Z3 = (X1Z2 + X2Z1)^2
+            return mul(x, z3) ^ mul(a2, mul(t1, t2)), z3  # X3 = xZ3 + a^2 * X1Z2 * X2Z1
+
+        x1, z1 = x, 1
+        x2, z2 = double(x, 1)
+        for bit in bin(scalar)[3:]:
+            if bit == '1':
+                x1, z1 = add(x1, z1, x2, z2)
+                x2, z2 = double(x2, z2)
+            else:
+                x2, z2 = add(x1, z1, x2, z2)
+                x1, z1 = double(x1, z1)
+
+        if z1 == 0:
+            return Point.infinity()
+        if z2 == 0:
+            return self._neg(point) if recover_y else Point(point.x, None)  # (k + 1)P = O, x(-P) = x(P)
+        if not recover_y:
+            return Point(mul(x1, self._field.invert(z1)), None)
+
+        # y восстанавливается по x(kP), x((k + 1)P) и P с одним обращением:
+        # xk = X1/Z1, yk = (xk + x)((X1 + xZ1)(X2 + xZ2) + (x^2 + ay)Z1Z2) / (axZ1Z2) + y
+        ax = mul(self._a, x)
+        inverse = self._field.invert(mul(ax, mul(z1, z2)))
+        xk = mul(mul(x1, mul(ax, z2)), inverse)
+        numerator = mul(x1 ^ mul(x, z1), x2 ^ mul(x, z2)) ^ mul(square(x) ^ mul(self._a, point.y), mul(z1, z2))
+        return Point(xk, mul(mul(xk ^ x, numerator), inverse) ^ point.y)
+
+    def _first_case_fraction(self, first_point: Point[int], second_point: Point[int]) -> Tuple[int, int]:
+        return first_point.y ^ second_point.y, first_point.x ^ second_point.x  # k = (y1 + y2) / (x1 + x2)
+
+    def _third_case_fraction(self, first_point: Point[int], second_point: Point[int]) -> Tuple[int, int]:
+        mul = self._field.mul
+        # k = ((x1)^2 + ay1) / ax1
+        return self._field.square(first_point.x) ^ mul(self._a, first_point.y), mul(self._a, first_point.x)
+
+    def _additive_point(self, first_point: Point[int], second_point: Point[int], coefficient: int) -> Point[int]:
+        mul = self._field.mul
+        # x3 = k^2 + ak + b + x1 + x2
+        x3 = self._field.square(coefficient) ^ mul(self._a, coefficient) ^ self._b ^ first_point.x ^ second_point.x
+        y3 = first_point.y ^ mul(coefficient, x3 ^ first_point.x)  # y3 = kx3+d = k(x3+x1) + y1
+
+        return Point(x3, mul(self._a, x3) ^ y3)
+
+
+class GF2KoblitzCurve(GF2NotSupersingularCurve):  # NSS2 с a = 1, b in {0, 1}, c = 1 (K-163..K-571)
+    # Фробениус τ(x, y) = (x^2, y^2) - эндоморфизм кривой Коблица, τ^2 = μτ - 2 при μ = (-1)^(1 - b).
+    # Скаляр раскладывается по степеням τ, и удвоения при умножении заменяются тремя возведениями в квадрат
+    def __init__(
+        self,
+        p: Polynomial,
+        a: Polynomial,
+        b: Polynomial,
+        c: Polynomial,
+        group: Optional[CurveGroup[Polynomial]] = None,
+    ):
+        super().__init__(p, a, b, c, group=group)
+        self._mu = 1 if self._b == 1 else -1
+        # τ^m = 1 на всех точках кривой, поэтому скаляр берется по модулю τ^m - 1 (норма - порядок кривой)
+        tau_m0, tau_m1 = tau_power(self._field.bit_length(), self._mu)
+        self._frobenius_period = (tau_m0 - 1, tau_m1)
+
+    def _wnaf_mul(self, first_point: Point[int], scalar: int, window: Optional[int] = None) -> Point[int]:
+        if window is None:
+            window = choose_wnaf_window(self._field.bit_length())
+
+        # После приведения в разложении около m цифр, ненулевых - примерно m / (w + 1)
+        digits = tau_wnaf(tau_mod((scalar, 0), self._frobenius_period, self._mu), window, self._mu)
+        multiples = self._tau_multiples(first_point, window)
+        negated_multiples = [self._neg(point) for point in multiples]
+
+        result = self._to_projective(Point.infinity())
+        for digit in reversed(digits):
+            result = self._frobenius(result)
+            if digit > 0:
+                result = self._projective_mixed_add(result, multiples[digit >> 1])
+            elif digit < 0:
+                result = self._projective_mixed_add(result, negated_multiples[-digit >> 1])
+        return self._to_affine(result)
+
+    def _tau_multiples(self, point: Point[int], window: int) -> List[Point[int]]:
+        # α_u * P для цифр τ-адического w-NAF; сами α_u малы и умножаются τ-NAF без окна, к аффинному виду - разом
+        negated = self._neg(point)
+        projective = []
+        for representative in tau_wnaf_representatives(window, self._mu):
+            result = self._to_projective(Point.infinity())
+            for digit in reversed(tau_wnaf(representative, 2, self._mu)):
+                result = self._frobenius(result)
+                if digit:
+                    result = self._projective_mixed_add(result, point if digit > 0 else negated)
+            projective.append(result)
+        return self._to_affine_batch(projective)
+
+    def _frobenius(self, point: ProjectivePoint[int]) -> ProjectivePoint[int]:
+        square = self._field.square
+        return ProjectivePoint(square(point.x), square(point.y), square(point.z))
 
 
 class GF2SupersingularCurve(GF2CurveBase):  # SS2
-    def _first_case_coefficient(self, first_point: Point[Polynomial], second_point: Point[Polynomial]) -> Polynomial:
-        return self._field.modulus((first_point.y + second_point.y) *
-                                   self._field.invert(first_point.x + second_point.x))  # k = (y1 + y2) / (x1 + x2)
+    def __init__(
+        self,
+        p: Polynomial,
+        a: Polynomial,
+        b: Polynomial,
+        c: Polynomial,
+        group: Optional[CurveGroup[Polynomial]] = None,
+    ):
+        super().__init__(p, a, b, c, group=group)
+        self._a_inv = None
+        if self._a == 0:
+            return
+        # Удвоение на суперсингулярной кривой - почти Фробениус: из уравнения кривой
+        # x3 = a^-2 * x^4 + a^-2 * b^2, y3 = a^-3 * y^4 + a^-3 * b * x^4 + a^-1 * c + a + a^-3 * (c^2 + b^3),
+        # так что a^-1 считается один раз на кривую, а умножения на коэффициенты (линейные над GF(2)) - по таблицам
+        mul, square, tables = self._field.mul, self._field.square, self._field.constant_mul_tables
+        self._a_inv = self._field.invert(self._a)
+        a_inv_2 = square(self._a_inv)
+        a_inv_3 = mul(a_inv_2, self._a_inv)
+        self._double_x_scale = tables(a_inv_2)
+        self._double_x_shift = tables(mul(square(self._b), a_inv_2))
+        self._double_y_scale = tables(a_inv_3)
+        self._double_xy_scale = tables(mul(self._b, a_inv_3))
+        self._double_y_shift = tables(mul(self._c, self._a_inv) ^ self._a ^
+                                      mul(square(self._c) ^ mul(square(self._b), self._b), a_inv_3))
 
-    def _third_case_coefficient(self, first_point: Point[Polynomial], second_point: Point[Polynomial]) -> Polynomial:
-        if self._field.modulus(self._a) == self._field.zero():
+    def _neg(self, point: Point[int]) -> Point[int]:
+        if point.is_infinite():
+            return point
+        return Point(point.x, point.y ^ self._a)  # -(x, y) = (x, y + a)
+
+    def _is_on_curve(self, point: Point[int]) -> bool:
+        mul, square = self._field.mul, self._field.square
+        x, y = point.x, point.y
+        # y^2 + ay = x^3 + bx + c
+        return square(y) ^ mul(self._a, y) ^ mul(square(x), x) ^ mul(self._b, x) ^ self._c == 0
+
+    def _projective_double(self, point: ProjectivePoint[int]) -> ProjectivePoint[int]:
+        if point.z == 0:
+            return ProjectivePoint(1, 0, 0)
+        if self._a_inv is None:
             raise CalculationError('Коэффиициент a не может быть 0')
-        # k = ((x1)^2 + b) / a
-        return self._field.modulus((first_point.x * first_point.x + self._b) * self._field.invert(self._a))
 
-    def _additive_point(
+        # Все, кроме X^4 * Z^4, - просмотры таблиц: четвертые степени и умножения на константы кривой
+        scale, fourth_power = self._field.apply_linear_tables, self._field.fourth_power
+        x4, z4 = fourth_power(point.x), fourth_power(point.z)
+        x3 = scale(self._double_x_scale, x4) ^ scale(self._double_x_shift, z4)  # X3 = a^-2 * X^4 + a^-2 * b^2 * Z^4
+        # Y3 = a^-3 * Y^4 + a^-3 * b * X^4 * Z^4 + y_shift * Z^8
+        y3 = (scale(self._double_y_scale, fourth_power(point.y)) ^
+              scale(self._double_xy_scale, self._field.mul(x4, z4)) ^
+              scale(self._double_y_shift, self._field.square(z4)))
+        return ProjectivePoint(x3, y3, z4)  # Z3 = Z^4
+
+    def _projective_add(
         self,
-        first_point: Point[Polynomial],
-        second_point: Point[Polynomial],
-        coefficient: Polynomial,
-    ) -> Point[Polynomial]:
-        x3 = self._field.modulus(coefficient * coefficient + first_point.x + second_point.x)  # x3 = k^2 + x1 + x2
-        y3 = self._field.modulus(first_point.y + coefficient * (x3 + first_point.x))  # y3 = y1 + k(x3 + x1)
-        return Point(x3, self._field.modulus(self._a + y3))
+        first_point: ProjectivePoint[int],
+        second_point: ProjectivePoint[int],
+    ) -> ProjectivePoint[int]:
+        if second_point.z == 0:
+            return first_point
+        if first_point.z == 0:
+            return second_point
+
+        mul, square = self._field.mul, self._field.square
+        # A = Y1Z2^2 + Y2Z1^2
+        aa = mul(first_point.y, square(second_point.z)) ^ mul(second_point.y, square(first_point.z))
+        bb = mul(first_point.x, second_point.z) ^ mul(second_point.x, first_point.z)  # B = X1Z2 + X2Z1
+        if bb == 0:
+            if aa == 0:
+                return self._projective_double(first_point)
+            return ProjectivePoint(1, 0, 0)
+
+        e = mul(first_point.z, bb)  # E = Z1 * B
+        c = mul(e, second_point.z)  # C = Z1 * Z2 * B
+        z3 = square(c)  # Z3 = C^2
+        x3 = square(aa) ^ mul(square(bb), c)  # X3 = A^2 + B^2 * C
+        # Y3 = A * C * X3 + Z3 * (E * (A * X2 + E * Y2) + a * Z3)
+        y3 = (mul(mul(aa, c), x3) ^
+              mul(z3, mul(e, mul(aa, second_point.x) ^ mul(e, second_point.y)) ^ mul(self._a, z3)))
+        return ProjectivePoint(x3, y3, z3)
+
+    def _projective_mixed_add(
+        self,
+        first_point: ProjectivePoint[int],
+        second_point: Point[int],
+    ) -> ProjectivePoint[int]:
+        if second_point.is_infinite():
+            return first_point
+        if first_point.z == 0:
+            return self._to_projective(second_point)
+
+        mul, square = self._field.mul, self._field.square
+        aa = first_point.y ^ mul(second_point.y, square(first_point.z))  # A = Y1 + y2 * Z1^2
+        bb = first_point.x ^ mul(second_point.x, first_point.z)  # B = X1 + x2 * Z1
+        if bb == 0:
+            if aa == 0:
+                return self._projective_double(self._to_projective(second_point))
+            return ProjectivePoint(1, 0, 0)
+
+        c = mul(first_point.z, bb)  # C = Z1 * B
+        z3 = square(c)  # Z3 = C^2
+        x3 = square(aa) ^ mul(square(bb), c)  # X3 = A^2 + B^2 * C
+        # Y3 = AC(X3 + x2 * Z3) + (y2 + a) * Z3^2
+        y3 = mul(mul(aa, c), x3 ^ mul(second_point.x, z3)) ^ mul(second_point.y ^ self._a, square(z3))
+        return ProjectivePoint(x3, y3, z3)
+
+    def _first_case_fraction(self, first_point: Point[int], second_point: Point[int]) -> Tuple[int, int]:
+        return first_point.y ^ second_point.y, first_point.x ^ second_point.x  # k = (y1 + y2) / (x1 + x2)
+
+    def _third_case_fraction(self, first_point: Point[int], second_point: Point[int]) -> Tuple[int, int]:
+        if self._a_inv is None:
+            raise CalculationError('Коэффиициент a не может быть 0')
+        return self._field.mul(self._field.square(first_point.x) ^ self._b, self._a_inv), 1  # k = ((x1)^2 + b) / a
+
+    def _additive_point(self, first_point: Point[int], second_point: Point[int], coefficient: int) -> Point[int]:
+        x3 = self._field.square(coefficient) ^ first_point.x ^ second_point.x  # x3 = k^2 + x1 + x2
+        y3 = first_point.y ^ self._field.mul(coefficient, x3 ^ first_point.x)  # y3 = y1 + k(x3 + x1)
+        return Point(x3, self._a ^ y3)
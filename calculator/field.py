@@ -1,21 +1,77 @@
 from abc import ABCMeta
 from abc import abstractmethod
+from array import array
+from collections import Counter
 from copy import deepcopy
+from functools import lru_cache
+from math import gcd
 from typing import Generic
+from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import Type
 from typing import TypeVar
 
-from calculator.polynomial import Polynomial
+from calculator.errors import CalculationError
+from calculator.instrumentation import count_calls
+from calculator.polynomial import carryless_mul
+from calculator.polynomial import carryless_square
 
 
 T = TypeVar('T')
 
+LOG_TABLE_MAX_DEGREE = 16  # таблицы логарифмов для GF(2^16) - 384 КБ на модуль
+INVERSE_TABLE_MAX_ORDER = 1 << 16  # таблица обратных для Z_p - до 256 КБ на модуль
+
+
+LinearTables = Tuple[List[int], ...]
+
+
+def gf2_linear_tables(images: List[int]) -> LinearTables:
+    # Линейное над GF(2) отображение L задается образами битов: L(x) = XOR tables[i][i-й байт x],
+    # где tables[i][byte] = L(byte * 2^(8i)). Так считаются квадрат, 4-я степень и умножение на константу
+    tables = []
+    for byte_index in range(0, len(images), 8):
+        byte_images = images[byte_index:byte_index + 8]
+        table = [0] * 256
+        for byte in range(1, 256):
+            low_bit = byte & -byte
+            table[byte] = table[byte ^ low_bit] ^ byte_images[low_bit.bit_length() - 1]
+        tables.append(table)
+    return tuple(tables)
+
+
+@lru_cache(maxsize=None)
+def gf2_power_tables(order: int, exponent: int) -> LinearTables:
+    # x -> x^(2^e) линейно, таблицы общие для всех полей с модулем order
+    degree = order.bit_length() - 1
+    images = []
+    for bit in range((degree + 7) // 8 * 8):
+        image = 1 << bit
+        for _ in range(exponent):
+            image = _gf2_reduce(carryless_square(image), order)
+        images.append(image)
+    return gf2_linear_tables(images)
+
+
+def _gf2_reduce(element: int, order: int) -> int:
+    degree = order.bit_length() - 1
+    while element.bit_length() > degree:
+        element ^= order << (element.bit_length() - 1 - degree)
+    return element
+
 
 class Field(Generic[T], metaclass=ABCMeta):
+    INSTRUMENTED_METHODS = {'mul': 'field_mul', 'square': 'field_square', 'fourth_power': 'field_fourth_power',
+                            'invert': 'field_invert', 'modulus': 'field_reduce'}
+
     def __init__(self, order: T, char: Optional[int] = None):
         self._order = order
         self._char = char
 
+    def instrument(self, counts: Counter):
+        count_calls(self, self.INSTRUMENTED_METHODS, counts)
+
     def invert(self, element: T) -> T:
         s, prev_s = self.zero(), self.one()
         r, prev_r = self._order, deepcopy(element)
@@ -28,12 +84,44 @@ class Field(Generic[T], metaclass=ABCMeta):
 
         return self.modulus(prev_s)
 
+    def batch_invert(self, elements: List[T]) -> List[T]:
+        # Трюк Монтгомери: одно обращение и 3(n - 1) умножений, нулевые элементы остаются нулями
+        zero = self.zero()
+        prefix_products = []
+        product = self.one()
+        for element in elements:
+            prefix_products.append(product)
+            if element != zero:
+                product = self.mul(product, element)
+
+        product_inv = self.invert(product)
+        inverses = [zero] * len(elements)
+        for index in range(len(elements) - 1, -1, -1):
+            element = elements[index]
+            if element != zero:
+                inverses[index] = self.mul(product_inv, prefix_products[index])
+                product_inv = self.mul(product_inv, element)
+        return inverses
+
     def modulus(self, element: T) -> T:
         return element % self._order
 
+    def mul(self, first: T, second: T) -> T:
+        return self.modulus(first * second)
+
+    def square(self, element: T) -> T:
+        return self.mul(element, element)
+
+    def fourth_power(self, element: T) -> T:
+        return self.square(self.square(element))
+
     def normalize_element(self, element: T) -> T:  # noqa
         return element
 
+    @abstractmethod
+    def bit_length(self) -> int:
+        raise NotImplementedError
+
     @classmethod
     @abstractmethod
     def zero(cls) -> T:
@@ -49,6 +137,21 @@ class ZpField(Field[int]):
     def __init__(self, order: int):
         super().__init__(order, order)
 
+    def invert(self, element: int) -> int:
+        try:
+            return pow(element, -1, self._order)
+        except ValueError:
+            raise CalculationError(f'Элемент {element} необратим по модулю {self._order}')
+
+    def modulus(self, element: int) -> int:
+        return element % self._order
+
+    def mul(self, first: int, second: int) -> int:
+        return first * second % self._order
+
+    def bit_length(self) -> int:
+        return self._order.bit_length()
+
     @classmethod
     def zero(cls) -> int:
         return 0
@@ -58,14 +161,229 @@ class ZpField(Field[int]):
         return 1
 
 
-class GF2PolynomialField(Field[Polynomial]):
-    def __init__(self, order: Polynomial):
+class ZpInverseTableField(ZpField):
+    # Малые p: все обратные считаются заранее, обращение - просмотр таблицы
+    def __init__(self, order: int):
+        super().__init__(order)
+        self._inverses = zp_inverse_table(order)
+
+    def invert(self, element: int) -> int:
+        inverse = self._inverses[element % self._order]
+        if inverse == 0:
+            raise CalculationError(f'Элемент {element} необратим по модулю {self._order}')
+        return inverse
+
+
+@lru_cache(maxsize=None)
+def zp_inverse_table(order: int) -> array:
+    # inv[i] = -(p // i) * inv[p mod i] mod p: из p = (p // i) * i + p mod i, всего O(p) умножений.
+    # Для составного order необратимые элементы остаются нулями
+    inverses = array('I', [0]) * order
+    if order > 1:
+        inverses[1] = 1
+    for element in range(2, order):
+        rest = inverses[order % element]
+        if rest:
+            inverses[element] = -(order // element) * rest % order
+        elif gcd(element, order) == 1:
+            inverses[element] = pow(element, -1, order)
+    return inverses
+
+
+def zp_field_cls(order: int) -> Type[ZpField]:
+    return ZpInverseTableField if order <= INVERSE_TABLE_MAX_ORDER else ZpField
+
+
+class GF2Field(Field[int]):
+    # Элементы GF(2^m) - int, i-й бит которого - коэффициент при x^i
+    SPARSE_ORDER_MAX_TERMS = 5  # трехчлены и пятичлены
+
+    def __init__(self, order: int):
         super().__init__(order, char=2)
+        self._degree = order.bit_length() - 1
+        self._low_mask = (1 << self._degree) - 1
+        # Степени младших членов модуля f = x^m + x^k1 + ... + 1 для быстрой редукции
+        self._reduction_powers = [power for power in range(self._degree) if order >> power & 1]
+        if len(self._reduction_powers) + 1 > self.SPARSE_ORDER_MAX_TERMS:
+            self._reduction_powers = None
+        # Квадрат и четвертая степень - по таблицам на модуль, без умножения и редукции
+        self._byte_length = (self._degree + 7) // 8
+        self._square_tables = gf2_power_tables(order, 1)
+        self._fourth_power_tables = gf2_power_tables(order, 2)
+
+    def modulus(self, element: int) -> int:
+        if self._reduction_powers is None:
+            while element.bit_length() > self._degree:
+                element ^= self._order << (element.bit_length() - 1 - self._degree)
+            return element
+
+        # x^m = x^k1 + ... + 1 (mod f): старшая часть целиком сворачивается сдвигами на k_i
+        while element >> self._degree:
+            high = element >> self._degree
+            element &= self._low_mask
+            for power in self._reduction_powers:
+                element ^= high << power
+        return element
+
+    def mul(self, first: int, second: int) -> int:
+        return self.modulus(carryless_mul(first, second))
+
+    def square(self, element: int) -> int:
+        return self.apply_linear_tables(self._square_tables, element)
+
+    def fourth_power(self, element: int) -> int:
+        return self.apply_linear_tables(self._fourth_power_tables, element)
+
+    def constant_mul_tables(self, constant: int) -> LinearTables:
+        # Для частых умножений на одну и ту же константу (коэффициенты кривой): образы битов x^i * c - сдвигами
+        images = []
+        image = self.modulus(constant)
+        for _ in range(self._byte_length * 8):
+            images.append(image)
+            image <<= 1
+            if image >> self._degree:
+                image ^= self._order
+        return gf2_linear_tables(images)
+
+    def invert(self, element: int) -> int:
+        # Расширенный алгоритм Евклида над битами int: u * g1 + v * g2 = a (mod f), деление заменено сдвигами
+        u, v = self.modulus(element), self._order
+        g1, g2 = 1, 0
+        while u != 1:
+            if u == 0:
+                raise CalculationError(f'Элемент {element} необратим по модулю {self._order}')
+            shift = u.bit_length() - v.bit_length()
+            if shift < 0:
+                u, v = v, u
+                g1, g2 = g2, g1
+                shift = -shift
+            u ^= v << shift
+            g1 ^= g2 << shift
+        return g1
+
+    def bit_length(self) -> int:
+        return self._degree
+
+    def apply_linear_tables(self, tables: LinearTables, element: int) -> int:
+        if element >> self._degree:
+            element = self.modulus(element)
+        result = 0
+        for table, byte in zip(tables, element.to_bytes(self._byte_length, 'little')):
+            result ^= table[byte]
+        return result
 
     @classmethod
-    def zero(cls) -> Polynomial:
-        return Polynomial(0)
+    def zero(cls) -> int:
+        return 0
 
     @classmethod
-    def one(cls) -> Polynomial:
-        return Polynomial(1)
+    def one(cls) -> int:
+        return 1
+
+
+class GF2LogTableField(GF2Field):
+    # Малые поля: ненулевые элементы - степени примитивного g, и a * b = g^(log a + log b), a^-1 = g^(-log a)
+    def __init__(self, order: int):
+        super().__init__(order)
+        self._group_order = (1 << self._degree) - 1
+        self._log, self._antilog = gf2_log_tables(order)
+
+    def mul(self, first: int, second: int) -> int:
+        if (first | second) >> self._degree:
+            first, second = self.modulus(first), self.modulus(second)
+        if first == 0 or second == 0:
+            return 0
+        return self._antilog[self._log[first] + self._log[second]]
+
+    def square(self, element: int) -> int:
+        return self.mul(element, element)
+
+    def fourth_power(self, element: int) -> int:
+        if element >> self._degree:
+            element = self.modulus(element)
+        if element == 0:
+            return 0
+        return self._antilog[4 * self._log[element] % self._group_order]
+
+    def invert(self, element: int) -> int:
+        if element >> self._degree:
+            element = self.modulus(element)
+        if element == 0:
+            raise CalculationError(f'Элемент {element} необратим по модулю {self._order}')
+        return self._antilog[self._group_order - self._log[element]]
+
+
+@lru_cache(maxsize=None)
+def gf2_log_tables(order: int) -> Tuple[array, array]:
+    # log[a] и antilog[i] = g^i; antilog удвоен, чтобы log a + log b не приводить по модулю 2^m - 1
+    if not gf2_is_irreducible(order):
+        raise CalculationError(f'Модуль {order} приводим: примитивного элемента нет')
+    field = GF2Field(order)
+    degree = order.bit_length() - 1
+    group_order = (1 << degree) - 1
+
+    def power(element: int, exponent: int) -> int:
+        result = 1
+        for bit in bin(exponent)[2:]:
+            result = field.square(result)
+            if bit == '1':
+                result = field.mul(result, element)
+        return result
+
+    # g примитивный, если g^((2^m - 1) / q) != 1 для всех простых q | 2^m - 1
+    cofactors = [group_order // prime for prime in prime_factors(group_order)]
+    generator = next(g for g in range(1, 1 << degree) if all(power(g, c) != 1 for c in cofactors))
+
+    log = array('H', [0]) * (1 << degree)
+    antilog = array('H', [0]) * (2 * group_order)
+    element = 1
+    for index in range(group_order):
+        log[element] = index
+        antilog[index] = antilog[index + group_order] = element
+        element = field.mul(element, generator)
+    return log, antilog
+
+
+def gf2_is_irreducible(order: int) -> bool:
+    # Тест Рабина: f степени m неприводим, если x^(2^m) = x (mod f) и НОД(x^(2^(m/q)) - x, f) = 1 для простых q | m
+    degree = order.bit_length() - 1
+    if degree < 1:
+        return False
+    x = _gf2_reduce(0b10, order)
+
+    def frobenius(element: int, times: int) -> int:
+        for _ in range(times):
+            element = _gf2_reduce(carryless_square(element), order)
+        return element
+
+    if frobenius(x, degree) != x:
+        return False
+    return all(_gf2_gcd(frobenius(x, degree // prime) ^ x, order) == 1 for prime in prime_factors(degree))
+
+
+def _gf2_gcd(first: int, second: int) -> int:
+    while second:
+        first, second = second, _gf2_reduce(first, second)
+    return first
+
+
+def prime_factors(number: int) -> List[int]:
+    factors = []
+    divisor = 2
+    while divisor * divisor <= number:
+        if number % divisor == 0:
+            factors.append(divisor)
+            while number % divisor == 0:
+                number //= divisor
+        divisor += 1
+    if number > 1:
+        factors.append(number)
+    return factors
+
+
+def gf2_field_cls(order: int) -> Type[GF2Field]:
+    # Для малых полей умножение и обращение - просмотр таблиц логарифмов; приводимый модуль (его можно задать
+    # явно) считается как и в больших полях, обычной арифметикой по модулю
+    if order.bit_length() - 1 <= LOG_TABLE_MAX_DEGREE and gf2_is_irreducible(order):
+        return GF2LogTableField
+    return GF2Field
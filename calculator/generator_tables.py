@@ -0,0 +1,41 @@
+import os
+import os.path
+from time import perf_counter
+
+from calculator.named_curves import dump_generator_table
+from calculator.named_curves import generator_table_path
+from calculator.named_curves import GENERATOR_TABLES_DIR
+from calculator.named_curves import NAMED_CURVES
+from calculator.parser import Parser
+
+
+FIELD_HEADERS = {
+    'Z_p': 'Z_p',
+    'GF': 'GF(2^n)',
+}
+
+
+# Пересборка таблиц кратных образующих стандартных кривых: python3 -m calculator.generator_tables
+def main():
+    os.makedirs(GENERATOR_TABLES_DIR, exist_ok=True)
+    for named_curve in NAMED_CURVES:
+        path = generator_table_path(named_curve)
+        if os.path.exists(path):
+            os.remove(path)
+
+        config = Parser.parse(input_lines=iter([f'{FIELD_HEADERS[named_curve.field_type]} {named_curve.name}']))
+        curve = config.build_runner().curve
+        generator = curve.group.generator
+        # n * G = O проверяется как 2 * ((n - 1) / 2 * G) + G: скаляр меньше n / 2 и не сокращается по модулю n
+        half = curve.mul(generator, (curve.group.order - 1) // 2)
+        if not curve.is_on_curve(generator) or not curve.add(curve.add(half, half), generator).is_infinite():
+            raise ValueError(f'Неверные параметры кривой {named_curve.name}: образующая не порядка n')
+
+        started = perf_counter()
+        curve.precompute(generator)
+        dump_generator_table(named_curve, curve.fixed_base_table(generator))
+        print(f'{named_curve.name:<8} {perf_counter() - started:>8.2f} с {os.path.getsize(path):>10} байт')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+from collections import Counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+
+# Счетчики операций включаются подменой методов на обертки и только по запросу:
+# без инструментирования вызовы идут напрямую в исходные методы и ничего не стоят
+
+def count_calls(owner: Any, methods: Dict[str, str], counts: Counter):
+    for name, key in methods.items():
+        setattr(owner, name, _counted(getattr(owner, name), key, counts))
+
+
+def _counted(method: Callable, key: str, counts: Counter) -> Callable:
+    def counted(*args, **kwargs):
+        counts[key] += 1
+        return method(*args, **kwargs)
+    return counted
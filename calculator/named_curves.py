@@ -0,0 +1,319 @@
+import os.path
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from calculator.elliptic import FixedBaseTable
+from calculator.elliptic import Point
+
+
+# Параметры стандартных кривых (FIPS 186-4, приложение D). Поле задается типом ('Z_p' или 'GF') и модулем
+# (для GF(2^m) - биты неприводимого многочлена), коэффициенты - как в заголовке входного файла:
+# a, b для Z_p и a1..a5 для GF(2^m). Образующая (x, y) и коэффициенты GF(2^m) - int, i-й бит - коэффициент при x^i
+@dataclass(frozen=True)
+class NamedCurve:
+    name: str
+    field_type: str
+    modulus: int
+    coefficients: Tuple[int, ...]
+    generator: Tuple[int, int]
+    order: int
+    cofactor: int
+
+
+NAMED_CURVES = [
+    NamedCurve(
+        name='P-192',
+        field_type='Z_p',
+        modulus=0xfffffffffffffffffffffffffffffffeffffffffffffffff,
+        coefficients=(-3, 0x64210519e59c80e70fa7e9ab72243049feb8deecc146b9b1),
+        generator=(
+            0x188da80eb03090f67cbf20eb43a18800f4ff0afd82ff1012,
+            0x07192b95ffc8da78631011ed6b24cdd573f977a11e794811,
+        ),
+        order=0xffffffffffffffffffffffff99def836146bc9b1b4d22831,
+        cofactor=1,
+    ),
+    NamedCurve(
+        name='P-224',
+        field_type='Z_p',
+        modulus=0xffffffffffffffffffffffffffffffff000000000000000000000001,
+        coefficients=(-3, 0xb4050a850c04b3abf54132565044b0b7d7bfd8ba270b39432355ffb4),
+        generator=(
+            0xb70e0cbd6bb4bf7f321390b94a03c1d356c21122343280d6115c1d21,
+            0xbd376388b5f723fb4c22dfe6cd4375a05a07476444d5819985007e34,
+        ),
+        order=0xffffffffffffffffffffffffffff16a2e0b8f03e13dd29455c5c2a3d,
+        cofactor=1,
+    ),
+    NamedCurve(
+        name='P-256',
+        field_type='Z_p',
+        modulus=0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff,
+        coefficients=(-3, 0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b),
+        generator=(
+            0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+            0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5,
+        ),
+        order=0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551,
+        cofactor=1,
+    ),
+    NamedCurve(
+        name='P-384',
+        field_type='Z_p',
+        modulus=int(
+            'fffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffe'
+            'ffffffff0000000000000000ffffffff', 16),
+        coefficients=(-3, int(
+            'b3312fa7e23ee7e4988e056be3f82d19181d9c6efe8141120314088f5013875a'
+            'c656398d8a2ed19d2a85c8edd3ec2aef', 16)),
+        generator=(
+            int('aa87ca22be8b05378eb1c71ef320ad746e1d3b628ba79b9859f741e082542a38'
+                '5502f25dbf55296c3a545e3872760ab7', 16),
+            int('3617de4a96262c6f5d9e98bf9292dc29f8f41dbd289a147ce9da3113b5f0b8c0'
+                '0a60b1ce1d7e819d7a431d7c90ea0e5f', 16),
+        ),
+        order=int(
+            'ffffffffffffffffffffffffffffffffffffffffffffffffc7634d81f4372ddf'
+            '581a0db248b0a77aecec196accc52973', 16),
+        cofactor=1,
+    ),
+    NamedCurve(
+        name='P-521',
+        field_type='Z_p',
+        modulus=2 ** 521 - 1,
+        coefficients=(-3, int(
+            '0051953eb9618e1c9a1f929a21a0b68540eea2da725b99b315f3b8b489918ef1'
+            '09e156193951ec7e937b1652c0bd3bb1bf073573df883d2c34f1ef451fd46b50'
+            '3f00', 16)),
+        generator=(
+            int('00c6858e06b70404e9cd9e3ecb662395b4429c648139053fb521f828af606b4d'
+                '3dbaa14b5e77efe75928fe1dc127a2ffa8de3348b3c1856a429bf97e7e31c2e5'
+                'bd66', 16),
+            int('011839296a789a3bc0045c8a5fb42c7d1bd998f54449579b446817afbd17273e'
+                '662c97ee72995ef42640c550b9013fad0761353c7086a272c24088be94769fd1'
+                '6650', 16),
+        ),
+        order=int(
+            '01ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff'
+            'fffa51868783bf2f966b7fcc0148f709a5d03bb5c9b8899c47aebb6fb71e9138'
+            '6409', 16),
+        cofactor=1,
+    ),
+    NamedCurve(
+        name='K-163',
+        field_type='GF',
+        modulus=2 ** 163 + 2 ** 7 + 2 ** 6 + 2 ** 3 + 1,
+        coefficients=(1, 0, 1, 0, 1),
+        generator=(
+            0x2fe13c0537bbc11acaa07d793de4e6d5e5c94eee8,
+            0x289070fb05d38ff58321f2e800536d538ccdaa3d9,
+        ),
+        order=0x4000000000000000000020108a2e0cc0d99f8a5ef,
+        cofactor=2,
+    ),
+    NamedCurve(
+        name='K-233',
+        field_type='GF',
+        modulus=2 ** 233 + 2 ** 74 + 1,
+        coefficients=(1, 0, 0, 0, 1),
+        generator=(
+            0x17232ba853a7e731af129f22ff4149563a419c26bf50a4c9d6eefad6126,
+            0x1db537dece819b7f70f555a67c427a8cd9bf18aeb9b56e0c11056fae6a3,
+        ),
+        order=0x8000000000000000000000000000069d5bb915bcd46efb1ad5f173abdf,
+        cofactor=4,
+    ),
+    NamedCurve(
+        name='K-283',
+        field_type='GF',
+        modulus=2 ** 283 + 2 ** 12 + 2 ** 7 + 2 ** 5 + 1,
+        coefficients=(1, 0, 0, 0, 1),
+        generator=(
+            0x503213f78ca44883f1a3b8162f188e553cd265f23c1567a16876913b0c2ac2458492836,
+            0x1ccda380f1c9e318d90f95d07e5426fe87e45c0e8184698e45962364e34116177dd2259,
+        ),
+        order=0x1ffffffffffffffffffffffffffffffffffe9ae2ed07577265dff7f94451e061e163c61,
+        cofactor=4,
+    ),
+    NamedCurve(
+        name='K-409',
+        field_type='GF',
+        modulus=2 ** 409 + 2 ** 87 + 1,
+        coefficients=(1, 0, 0, 0, 1),
+        generator=(
+            0x60f05f658f49c1ad3ab1890f7184210efd0987e307c84c27accfb8f9f67cc2c460189eb5aaaa62ee222eb1b35540cfe9023746,
+            0x1e369050b7c4e42acba1dacbf04299c3460782f918ea427e6325165e9ea10e3da5f6c42e9c55215aa9ca27a5863ec48d8e0286b,
+        ),
+        order=0x7ffffffffffffffffffffffffffffffffffffffffffffffffffe5f83b2d4ea20400ec4557d5ed3e3e7ca5b4b5c83b8e01e5fcf,
+        cofactor=4,
+    ),
+    NamedCurve(
+        name='K-571',
+        field_type='GF',
+        modulus=2 ** 571 + 2 ** 10 + 2 ** 5 + 2 ** 2 + 1,
+        coefficients=(1, 0, 0, 0, 1),
+        generator=(
+            int(
+                '026eb7a859923fbc82189631f8103fe4ac9ca2970012d5d46024804801841ca4'
+                '4370958493b205e647da304db4ceb08cbbd1ba39494776fb988b47174dca88c7'
+                'e2945283a01c8972', 16),
+            int(
+                '0349dc807f4fbf374f4aeade3bca95314dd58cec9f307a54ffc61efc006d8a2c'
+                '9d4979c0ac44aea74fbebbb9f772aedcb620b01a7ba7af1b320430c8591984f6'
+                '01cd4c143ef1c7a3', 16),
+        ),
+        order=int(
+            '0200000000000000000000000000000000000000000000000000000000000000'
+            '00000000131850e1f19a63e4b391a8db917f4138b630d84be5d639381e91deb4'
+            '5cfe778f637c1001', 16),
+        cofactor=4,
+    ),
+    NamedCurve(
+        name='B-163',
+        field_type='GF',
+        modulus=2 ** 163 + 2 ** 7 + 2 ** 6 + 2 ** 3 + 1,
+        coefficients=(1, 0, 1, 0, 0x20a601907b8c953ca1481eb10512f78744a3205fd),
+        generator=(
+            0x3f0eba16286a2d57ea0991168d4994637e8343e36,
+            0xd51fbc6c71a0094fa2cdd545b11c5c0c797324f1,
+        ),
+        order=0x40000000000000000000292fe77e70c12a4234c33,
+        cofactor=2,
+    ),
+    NamedCurve(
+        name='B-233',
+        field_type='GF',
+        modulus=2 ** 233 + 2 ** 74 + 1,
+        coefficients=(1, 0, 1, 0, 0x66647ede6c332c7f8c0923bb58213b333b20e9ce4281fe115f7d8f90ad),
+        generator=(
+            0xfac9dfcbac8313bb2139f1bb755fef65bc391f8b36f8f8eb7371fd558b,
+            0x1006a08a41903350678e58528bebf8a0beff867a7ca36716f7e01f81052,
+        ),
+        order=0x1000000000000000000000000000013e974e72f8a6922031d2603cfe0d7,
+        cofactor=2,
+    ),
+    NamedCurve(
+        name='B-283',
+        field_type='GF',
+        modulus=2 ** 283 + 2 ** 12 + 2 ** 7 + 2 ** 5 + 1,
+        coefficients=(1, 0, 1, 0, 0x27b680ac8b8596da5a4af8a19a0303fca97fd7645309fa2a581485af6263e313b79a2f5),
+        generator=(
+            0x5f939258db7dd90e1934f8c70b0dfec2eed25b8557eac9c80e2e198f8cdbecd86b12053,
+            0x3676854fe24141cb98fe6d4b20d02b4516ff702350eddb0826779c813f0df45be8112f4,
+        ),
+        order=0x3ffffffffffffffffffffffffffffffffffef90399660fc938a90165b042a7cefadb307,
+        cofactor=2,
+    ),
+    NamedCurve(
+        name='B-409',
+        field_type='GF',
+        modulus=2 ** 409 + 2 ** 87 + 1,
+        coefficients=(1, 0, 1, 0, int(
+                            '21a5c2c8ee9feb5c4b9a753b7b476b7fd6422ef1f3dd674761fa99d6ac27c8a9'
+                            'a197b272822f6cd57a55aa4f50ae317b13545f', 16)),
+        generator=(
+            0x15d4860d088ddb3496b0c6064756260441cde4af1771d4db01ffe5b34e59703dc255a868a1180515603aeab60794e54bb7996a7,
+            0x61b1cfab6be5f32bbfa78324ed106a7636b9c5a7bd198d0158aa4f5488d08f38514f1fdf4b4f40d2181b3681c364ba0273c706,
+        ),
+        order=0x10000000000000000000000000000000000000000000000000001e2aad6a612f33307be5fa47c3c9e052f838164cd37d9a21173,
+        cofactor=2,
+    ),
+    NamedCurve(
+        name='B-571',
+        field_type='GF',
+        modulus=2 ** 571 + 2 ** 10 + 2 ** 5 + 2 ** 2 + 1,
+        coefficients=(1, 0, 1, 0, int(
+                            '02f40e7e2221f295de297117b7f3d62f5c6a97ffcb8ceff1cd6ba8ce4a9a18ad'
+                            '84ffabbd8efa59332be7ad6756a66e294afd185a78ff12aa520e4de739baca0c'
+                            '7ffeff7f2955727a', 16)),
+        generator=(
+            int(
+                '0303001d34b856296c16c0d40d3cd7750a93d1d2955fa80aa5f40fc8db7b2abd'
+                'bde53950f4c0d293cdd711a35b67fb1499ae60038614f1394abfa3b4c850d927'
+                'e1e7769c8eec2d19', 16),
+            int(
+                '037bf27342da639b6dccfffeb73d69d78c6c27a6009cbbca1980f8533921e8a6'
+                '84423e43bab08a576291af8f461bb2a8b3531d2f0485c19b16e2f1516e23dd3c'
+                '1a4827af1b8ac15b', 16),
+        ),
+        order=int(
+            '03ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff'
+            'ffffffffe661ce18ff55987308059b186823851ec7dd9ca1161de93d5174d66e'
+            '8382e9bb2fe84e47', 16),
+        cofactor=2,
+    ),
+]
+
+
+def _curve_key(field_type: str, modulus: int, coefficients: Tuple[int, ...]) -> Tuple[str, int, Tuple[int, ...]]:
+    if field_type == 'Z_p':
+        coefficients = tuple(coefficient % modulus for coefficient in coefficients)
+    return field_type, modulus, coefficients
+
+
+GENERATOR_TABLES_DIR = os.path.join(os.path.dirname(__file__), 'data')
+# Файл таблицы: заголовок (сигнатура, окно, биты таблицы, байт на координату, число строк),
+# затем аффинные точки строк подряд - x и y big-endian фиксированной длины
+GENERATOR_TABLE_HEADER = struct.Struct('>4sBHHH')
+GENERATOR_TABLE_MAGIC = b'ECGT'
+
+
+_NAMED_CURVES_BY_NAME: Dict[str, NamedCurve] = {curve.name: curve for curve in NAMED_CURVES}
+_NAMED_CURVES_BY_PARAMETERS: Dict[Tuple[str, int, Tuple[int, ...]], NamedCurve] = {
+    _curve_key(curve.field_type, curve.modulus, curve.coefficients): curve for curve in NAMED_CURVES
+}
+
+
+def find_named_curve(field_type: str, modulus: int, coefficients: Tuple[int, ...]) -> Optional[NamedCurve]:
+    # Стандартная кривая, заданная в файле явными параметрами, опознается по ним
+    return _NAMED_CURVES_BY_PARAMETERS.get(_curve_key(field_type, modulus, coefficients))
+
+
+def get_named_curve(name: str) -> Optional[NamedCurve]:
+    return _NAMED_CURVES_BY_NAME.get(name.upper())
+
+
+def generator_table_path(curve: NamedCurve) -> str:
+    return os.path.join(GENERATOR_TABLES_DIR, f'{curve.name}.bin')
+
+
+@lru_cache(maxsize=None)
+def load_generator_table(curve: NamedCurve) -> Optional[FixedBaseTable[int]]:
+    # Таблица читается при первом умножении образующей и затем общая для всех кривых процесса
+    path = generator_table_path(curve)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'rb') as table_f:
+        data = table_f.read()
+    magic, window, bits, coordinate_size, rows = GENERATOR_TABLE_HEADER.unpack_from(data)
+    if magic != GENERATOR_TABLE_MAGIC:
+        raise ValueError(f'Неверный формат таблицы образующей: {path}')
+
+    row_size = (1 << window) - 1
+    offset = GENERATOR_TABLE_HEADER.size
+    multiples = []
+    for _ in range(rows):
+        row = []
+        for _ in range(row_size):
+            x = int.from_bytes(data[offset:offset + coordinate_size], 'big')
+            y = int.from_bytes(data[offset + coordinate_size:offset + 2 * coordinate_size], 'big')
+            row.append(Point(x, y))
+            offset += 2 * coordinate_size
+        multiples.append(row)
+    return FixedBaseTable(window=window, bits=bits, multiples=multiples)
+
+
+def dump_generator_table(curve: NamedCurve, table: FixedBaseTable[int]):
+    coordinate_size = (curve.modulus.bit_length() + 7) // 8
+    with open(generator_table_path(curve), 'wb') as table_f:
+        table_f.write(GENERATOR_TABLE_HEADER.pack(
+            GENERATOR_TABLE_MAGIC, table.window, table.bits, coordinate_size, len(table.multiples),
+        ))
+        for row in table.multiples:
+            for point in row:
+                table_f.write(point.x.to_bytes(coordinate_size, 'big') + point.y.to_bytes(coordinate_size, 'big'))
@@ -67,6 +67,8 @@ class PointFormatter(Formatter[Point]):
 
         formatter = self._registry.get(type(item.x))
         x_str = formatter.format(item.x)
+        if item.y is None:
+            return x_str  # результат умножения только по x
         y_str = formatter.format(item.y)
 
         return f'({x_str}, {y_str})'
@@ -82,11 +84,18 @@ class TaskConfigFormatter(Formatter[TaskConfig]):
         self._int_formatter = int_formatter
 
     def format(self, item: TaskConfig) -> str:
-        if item.task_type is TaskType.MUL:
+        if item.task_type in (TaskType.MUL, TaskType.X_ONLY_MUL):
             point = self._point_formatter.format(item.points[0])
             scalar = self._int_formatter.format(item.scalar)
             return f'{point} * {scalar}'
 
+        if item.task_type in (TaskType.LINEAR_COMBINATION, TaskType.MULTI_SCALAR_MUL):
+            terms = [
+                f'{self._point_formatter.format(point)} * {self._int_formatter.format(scalar)}'
+                for point, scalar in zip(item.points, item.scalars)
+            ]
+            return ' + '.join(terms)
+
         if item.task_type is TaskType.ADD:
             points = [
                 self._point_formatter.format(point,)
@@ -7,12 +7,15 @@ from typing import Callable
 from typing import Generic
 from typing import Iterator
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import TypeVar
 from typing import Union
 
 from calculator.elliptic import Point
 from calculator.common import parse_int
 from calculator.errors import ParserError
+from calculator.named_curves import get_named_curve
 from calculator.polynomial_parser import parse_polynomial
 from calculator.polynomial import Polynomial
 from calculator.task import FieldType
@@ -90,9 +93,18 @@ PARSE_POINT_OPERAND_FUNCTIONS_MAP = {
 }
 
 
+NAMED_CURVE_ELEMENT_FUNCTIONS_MAP = {
+    FieldType.Z_p: int,
+    FieldType.GF: Polynomial,
+}
+
+
 TASKS_TYPES_MAP = {
     'a': TaskType.ADD,
     'm': TaskType.MUL,
+    'l': TaskType.LINEAR_COMBINATION,
+    's': TaskType.MULTI_SCALAR_MUL,
+    'x': TaskType.X_ONLY_MUL,
 }
 
 
@@ -108,37 +120,74 @@ class _ParserContext(Generic[T]):
     ):
         self._configurator = configurator
         self._parse_point_operand_function = parse_point_operand_function
+        self._x_only_supported = False
 
-    def do_parse(self, input_lines: Iterator[str]) -> TaskRunnerConfig[T]:
-        field_args = self._configurator.field_args_provider.provide(input_lines)
-        curve_args = self._configurator.curve_args_provider.provide(input_lines)
-        task_configs = [self._parse_task(line) for line in input_lines]
-
-        return TaskRunnerConfig(
+    def do_parse(
+        self,
+        input_lines: Iterator[str],
+        streaming: bool = False,
+        curve_name: Optional[str] = None,
+    ) -> TaskRunnerConfig[T]:
+        if curve_name is not None:
+            field_args, curve_args = self._named_curve_args(curve_name)
+        else:
+            field_args = self._configurator.field_args_provider.provide(input_lines)
+            curve_args = self._configurator.curve_args_provider.provide(input_lines)
+        config = TaskRunnerConfig(
             field_type=self._configurator.field_type,
             field_args=field_args,
             curve_args=curve_args,
-            task_configs=task_configs,
+            task_configs=[],
         )
+        # Задачу x на кривой без лестницы Монтгомери лучше отвергнуть при разборе, а не при счете
+        self._x_only_supported = config.supports_x_only_mul()
+        config.task_configs = self._parse_tasks(input_lines)
+        if not streaming:
+            config.task_configs = list(config.task_configs)
+        return config
+
+    def _named_curve_args(self, curve_name: str) -> Tuple[List[Any], List[Any]]:
+        named_curve = get_named_curve(curve_name)
+        if named_curve is None or named_curve.field_type != self._configurator.field_type.name:
+            raise ParserError(f'Неизвестная кривая {curve_name} для поля {self._configurator.field_type.name}')
+
+        to_element = NAMED_CURVE_ELEMENT_FUNCTIONS_MAP[self._configurator.field_type]
+        return [to_element(named_curve.modulus)], [to_element(coefficient) for coefficient in named_curve.coefficients]
+
+    def _parse_tasks(self, input_lines: Iterator[str]) -> Iterator[TaskConfig[T]]:
+        # Задачи разбираются лениво, по мере того как их забирает TaskRunner
+        for line in input_lines:
+            try:
+                yield self._parse_task(line)
+            except ParserError:
+                raise
+            except Exception as e:
+                raise ParserError(e) from e
 
     def _parse_task(self, line: str) -> TaskConfig[T]:
         line = line.lower().strip()
         line = self.POINT_PATTERN.sub(r'(\1,\2)', line)
 
-        try:
-            task_type, operand_1, operand_2 = self.TOKENS_DELIMITER.split(line.lower())
-        except ValueError:
-            raise ParserError(f'Ошибка парсинга задачи: {line}')
+        task_type, *operands = self.TOKENS_DELIMITER.split(line.lower())
 
         try:
             task_type = TASKS_TYPES_MAP[task_type]
         except KeyError:
             raise ParserError(f'Неизвестный тип операции: {line}')
 
+        if task_type is TaskType.X_ONLY_MUL and not self._x_only_supported:
+            raise ParserError(f'Умножение только по x есть лишь для несуперсингулярных кривых над GF(2^m): {line}')
+
+        if task_type in (TaskType.LINEAR_COMBINATION, TaskType.MULTI_SCALAR_MUL):
+            return self._parse_linear_combination(task_type, line, operands)
+
+        if len(operands) != 2:
+            raise ParserError(f'Ошибка парсинга задачи: {line}')
+
         scalars = []
         points = []
 
-        for operand in operand_1, operand_2:
+        for operand in operands:
             operand = self._parse_task_operand(operand)
 
             if isinstance(operand, int):
@@ -152,13 +201,32 @@ class _ParserContext(Generic[T]):
 
             return TaskConfig(task_type, points=tuple(points))  # noqa
 
-        if task_type is TaskType.MUL:
+        if task_type in (TaskType.MUL, TaskType.X_ONLY_MUL):
             if len(points) != 1 or len(scalars) != 1:
                 raise ValueError(f'Для операции умножения один операнда - точка, второй - скаляр: {line}')
 
             return TaskConfig(task_type, points=tuple(points), scalar=scalars[0])  # noqa
 
+    def _parse_linear_combination(self, task_type: TaskType, line: str, operands: List[str]) -> TaskConfig[T]:
+        # Операнды идут парами точка-коэффициент (в любом порядке внутри пары)
+        if len(operands) < 2 or len(operands) % 2:
+            raise ParserError(f'Для линейной комбинации нужны пары точка и коэффициент: {line}')
+
+        points = []
+        scalars = []
+        for index in range(0, len(operands), 2):
+            pair = [self._parse_task_operand(operand) for operand in operands[index:index + 2]]
+            pair.sort(key=lambda operand: not isinstance(operand, Point))
+            point, scalar = pair
+            if not isinstance(point, Point) or not isinstance(scalar, int):
+                raise ValueError(f'В каждой паре линейной комбинации одна точка и один коэффициент: {line}')
+            points.append(point)
+            scalars.append(scalar)
+
+        return TaskConfig(task_type, points=tuple(points), scalars=tuple(scalars))
+
     def _parse_task_operand(self, operand: str) -> Union[int, Point[T]]:
+        operand = operand.rstrip(',')
         if '(' not in operand:
             return parse_int(operand)
 
@@ -175,11 +243,14 @@ class _ParserContext(Generic[T]):
 
 class Parser:
     @staticmethod
-    def parse(input_lines: Iterator[str]) -> TaskRunnerConfig:
-        field_type = next(input_lines).strip()
+    def parse(input_lines: Iterator[str], streaming: bool = False) -> TaskRunnerConfig:
+        # Заголовок - тип поля, за которым либо идут параметры кривой, либо в той же строке имя стандартной кривой
+        header = next(input_lines).split()
+        field_type = header[0] if header else ''
+        curve_name = header[1] if len(header) == 2 else None
 
-        if field_type not in FIELDS_CONFIGURATORS_MAP:
-            raise ParserError(f'Неизвестный тип поля: {field_type}')
+        if field_type not in FIELDS_CONFIGURATORS_MAP or len(header) > 2:
+            raise ParserError(f'Неизвестный тип поля: {" ".join(header)}')
 
         configurator = FIELDS_CONFIGURATORS_MAP[field_type]
         parse_point_operand_function = (
@@ -189,7 +260,7 @@ class Parser:
         parser_ctx = _ParserContext(configurator, parse_point_operand_function)
 
         try:
-            return parser_ctx.do_parse(input_lines)
+            return parser_ctx.do_parse(input_lines, streaming=streaming, curve_name=curve_name)
         except ParserError:
             raise
         except Exception as e:
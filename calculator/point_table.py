@@ -0,0 +1,125 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from calculator.field import prime_factors
+from calculator.field import zp_inverse_table
+
+
+POINT_TABLE_MAX_ORDER = 1 << 16
+POINT_TABLE_GENERATOR_TRIES = 64
+POINT_TABLE_BUILD_COST = 16  # построение таблицы стоит примерно p / 16 обычных операций над точками
+
+AffinePoint = Optional[Tuple[int, int]]  # None - точка O
+
+
+@dataclass
+class CyclicPointTable:
+    # Вся группа E(Z_p) = <G>: точка i * G хранится под индексом i, сложение и умножение - арифметика индексов mod N
+    p: int
+    order: int  # N = #E(Z_p)
+    xs: array  # xs[i], ys[i] - координаты i * G (индекс 0 - точка O, координаты не используются)
+    ys: array
+    index_by_x: array  # индекс одной из двух точек с данным x, вторая - ее отрицание с индексом N - i; -1 - точек нет
+
+    def index(self, x: int, y: int) -> Optional[int]:
+        # None - точка не на кривой (или координаты не приведены)
+        if not 0 <= x < self.p:
+            return None
+        index = self.index_by_x[x]
+        if index < 0:
+            return None
+        if self.ys[index] == y:
+            return index
+        if (self.p - self.ys[index]) % self.p == y:
+            return (self.order - index) % self.order
+        return None
+
+    def point(self, index: int) -> AffinePoint:
+        index %= self.order
+        if index == 0:
+            return None
+        return self.xs[index], self.ys[index]
+
+
+_point_tables: Dict[Tuple[int, int, int], Optional[CyclicPointTable]] = {}
+_operation_counts: Counter = Counter()
+
+
+def get_point_table(p: int, a: int, b: int, operations: int = 1) -> Optional[CyclicPointTable]:
+    # Таблица общая для всех кривых (и файлов) процесса с теми же (p, a, b) и строится лениво: только когда
+    # операций на кривой набралось столько, что построение окупится; до этого - None и обычные вычисления
+    key = (p, a % p, b % p)
+    if key in _point_tables:
+        return _point_tables[key]
+    if p > POINT_TABLE_MAX_ORDER:
+        _point_tables[key] = None
+        return None
+    _operation_counts[key] += operations
+    if _operation_counts[key] * POINT_TABLE_BUILD_COST < p:
+        return None
+    _point_tables[key] = build_point_table(*key)
+    return _point_tables[key]
+
+
+def build_point_table(p: int, a: int, b: int) -> Optional[CyclicPointTable]:
+    # None, если кривая особая, p не простое или группа не циклическая (образующая не нашлась)
+    if p < 5 or (4 * a ** 3 + 27 * b ** 2) % p == 0 or any(p % d == 0 for d in range(2, int(p ** 0.5) + 1)):
+        return None
+    inverses = zp_inverse_table(p)
+
+    roots = array('i', [-1]) * p  # roots[y^2 mod p] = y
+    for y in range(p):
+        roots[y * y % p] = y
+    points = []
+    for x in range(p):
+        y = roots[(x * x * x + a * x + b) % p]
+        if y >= 0:
+            points.append((x, y))
+    order = 1 + sum(1 if y == 0 else 2 for _, y in points)
+
+    def add(first: AffinePoint, second: AffinePoint) -> AffinePoint:
+        if first is None:
+            return second
+        if second is None:
+            return first
+        (x1, y1), (x2, y2) = first, second
+        if x1 == x2:
+            if (y1 + y2) % p == 0:
+                return None
+            slope = (3 * x1 * x1 + a) * inverses[2 * y1 % p] % p
+        else:
+            slope = (y2 - y1) * inverses[(x2 - x1) % p] % p
+        x3 = (slope * slope - x1 - x2) % p
+        return x3, (slope * (x1 - x3) - y1) % p
+
+    def mul(point: AffinePoint, scalar: int) -> AffinePoint:
+        result = None
+        for bit in bin(scalar)[2:]:
+            result = add(result, result)
+            if bit == '1':
+                result = add(result, point)
+        return result
+
+    # Образующая - точка порядка N: (N / q) * G != O для всех простых q | N
+    cofactors = [order // prime for prime in prime_factors(order)]
+    step = max(1, len(points) // POINT_TABLE_GENERATOR_TRIES)
+    generator = next((point for point in points[::step] if all(mul(point, c) is not None for c in cofactors)), None)
+    if generator is None:
+        return None
+
+    xs = array('I', [0]) * order
+    ys = array('I', [0]) * order
+    index_by_x = array('i', [-1]) * p
+    current = generator
+    for index in range(1, order):
+        x, y = current
+        xs[index], ys[index] = x, y
+        if index_by_x[x] < 0:
+            index_by_x[x] = index
+        current = add(current, generator)
+    return CyclicPointTable(p, order, xs, ys, index_by_x)
+
@@ -7,9 +7,49 @@ from calculator.utils import convert_bits_array_to_num
 from calculator.utils import convert_num_to_bits_array
 
 
+COMB_MUL_MIN_BITS = 32
+COMB_WINDOW = 4
+# SQUARE_SPREAD_TABLE[byte] - биты байта, разреженные нулями: (b7...b0)^2 = 0b7...0b0
+SQUARE_SPREAD_TABLE = [
+    sum(((byte >> bit) & 1) << (2 * bit) for bit in range(8)).to_bytes(2, 'little')
+    for byte in range(256)
+]
+
+
+def carryless_mul(first: int, second: int) -> int:
+    if second.bit_length() < COMB_MUL_MIN_BITS:
+        result = 0
+        while second:
+            if second & 1:
+                result ^= first
+            first <<= 1
+            second >>= 1
+        return result
+
+    # Оконный метод: таблица first * d для всех 4-битных d, затем по 4 бита множителя за шаг
+    table = [0] * (1 << COMB_WINDOW)
+    for digit in range(1, 1 << COMB_WINDOW):
+        table[digit] = table[digit >> 1] << 1 if digit % 2 == 0 else table[digit - 1] ^ first
+
+    result = 0
+    mask = (1 << COMB_WINDOW) - 1
+    top_shift = (second.bit_length() - 1) // COMB_WINDOW * COMB_WINDOW
+    for shift in range(top_shift, -1, -COMB_WINDOW):
+        result = (result << COMB_WINDOW) ^ table[(second >> shift) & mask]
+    return result
+
+
+def carryless_square(number: int) -> int:
+    # Возведение в квадрат над GF(2) линейно: каждый бит числа просто переезжает на четную позицию
+    number_bytes = number.to_bytes((number.bit_length() + 7) // 8, 'little')
+    return int.from_bytes(b''.join(SQUARE_SPREAD_TABLE[byte] for byte in number_bytes), 'little')
+
+
 class Polynomial:
+    __slots__ = ('_bits',)
+
     def __init__(self, num_or_bits: Union[int, Iterable[Union[int, float]]]):
-        if isinstance(num_or_bits, IterableABC):
+        if type(num_or_bits) is not int and isinstance(num_or_bits, IterableABC):
             self._bits = convert_bits_array_to_num(num_or_bits)
         else:
             self._bits = num_or_bits
@@ -24,6 +64,9 @@ class Polynomial:
 
         return self.bits == other.bits
 
+    def __hash__(self):
+        return hash(self.bits)
+
     def __add__(self, other: 'Polynomial') -> 'Polynomial':
         return Polynomial(self.bits ^ other.bits)
 
@@ -34,19 +77,7 @@ class Polynomial:
         return self.bits.bit_length()
 
     def __mul__(self, other: 'Polynomial') -> 'Polynomial':
-        result, addend = Polynomial(0), Polynomial(self.bits)
-        otherbits = other.bits
-
-        while otherbits:
-            shift = otherbits & 1
-
-            if shift:
-                result += addend
-
-            addend <<= 1
-            otherbits >>= 1
-
-        return result
+        return Polynomial(carryless_mul(self.bits, other.bits))
 
     def __mod__(self, other: 'Polynomial') -> 'Polynomial':
         self_polynomial = Polynomial(self.bits)
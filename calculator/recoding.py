@@ -0,0 +1,132 @@
+from fractions import Fraction
+from functools import lru_cache
+from typing import List
+from typing import Tuple
+
+
+def wnaf(scalar: int, window: int) -> List[int]:
+    # Цифры w-NAF от младшей к старшей: нечетные |d| < 2^(w-1), между ненулевыми цифрами не меньше w - 1 нулей
+    digits = []
+    modulus = 1 << window
+    half = modulus >> 1
+
+    while scalar:
+        digit = 0
+        if scalar & 1:
+            digit = scalar & (modulus - 1)
+            if digit >= half:
+                digit -= modulus
+            scalar -= digit
+        digits.append(digit)
+        scalar >>= 1
+
+    return digits
+
+
+def joint_sparse_form(first: int, second: int) -> List[Tuple[int, int]]:
+    # JSF Солинаса, пары цифр от младшей к старшей: цифры из {-1, 0, 1}, ненулевых столбцов в среднем половина
+    digits = []
+    while first or second:
+        first_digit = second_digit = 0
+        if first & 1:
+            first_digit = 2 - (first & 3)
+            if first & 7 in (3, 5) and second & 3 == 2:
+                first_digit = -first_digit
+        if second & 1:
+            second_digit = 2 - (second & 3)
+            if second & 7 in (3, 5) and first & 3 == 2:
+                second_digit = -second_digit
+        digits.append((first_digit, second_digit))
+        first = (first - first_digit) >> 1
+        second = (second - second_digit) >> 1
+    return digits
+
+
+# Элементы Z[τ] - пары (r0, r1) = r0 + r1τ, где τ - отображение Фробениуса кривой Коблица: τ^2 = μτ - 2, μ = ±1
+
+def tau_mul(first: Tuple[int, int], second: Tuple[int, int], mu: int) -> Tuple[int, int]:
+    (a0, a1), (b0, b1) = first, second
+    return a0 * b0 - 2 * a1 * b1, a0 * b1 + a1 * b0 + mu * a1 * b1
+
+
+def tau_norm(element: Tuple[int, int], mu: int) -> int:
+    r0, r1 = element
+    return r0 * r0 + mu * r0 * r1 + 2 * r1 * r1
+
+
+@lru_cache(maxsize=None)
+def tau_power(exponent: int, mu: int) -> Tuple[int, int]:
+    r0, r1 = 1, 0
+    for _ in range(exponent):
+        r0, r1 = -2 * r1, r0 + mu * r1  # (r0 + r1τ)τ = r0τ + r1(μτ - 2)
+    return r0, r1
+
+
+def tau_round(lambda0: Fraction, lambda1: Fraction, mu: int) -> Tuple[int, int]:
+    # Округление λ0 + λ1τ до ближайшего элемента Z[τ] по норме (Солинас)
+    f0, f1 = round(lambda0), round(lambda1)
+    eta0, eta1 = lambda0 - f0, lambda1 - f1
+    h0 = h1 = 0
+    eta = 2 * eta0 + mu * eta1
+    if eta >= 1:
+        if eta0 - 3 * mu * eta1 < -1:
+            h1 = mu
+        else:
+            h0 = 1
+    elif eta0 + 4 * mu * eta1 >= 2:
+        h1 = mu
+    if eta < -1:
+        if eta0 - 3 * mu * eta1 >= 1:
+            h1 = -mu
+        else:
+            h0 = -1
+    elif eta0 + 4 * mu * eta1 < -2:
+        h1 = -mu
+    return f0 + h0, f1 + h1
+
+
+def tau_mod(element: Tuple[int, int], divisor: Tuple[int, int], mu: int) -> Tuple[int, int]:
+    # element - round(element / divisor) * divisor, деление - через сопряженное: d * conj(d) = N(d)
+    d0, d1 = divisor
+    norm = tau_norm(divisor, mu)
+    n0, n1 = tau_mul(element, (d0 + mu * d1, -d1), mu)
+    q = tau_round(Fraction(n0, norm), Fraction(n1, norm), mu)
+    q0, q1 = tau_mul(q, divisor, mu)
+    return element[0] - q0, element[1] - q1
+
+
+@lru_cache(maxsize=None)
+def tau_wnaf_representatives(window: int, mu: int) -> List[Tuple[int, int]]:
+    # α_u = u mod τ^w для нечетных u = 1, 3, ..., 2^(w-1) - 1 - значения цифр τ-адического w-NAF
+    divisor = tau_power(window, mu)
+    return [tau_mod((u, 0), divisor, mu) for u in range(1, 1 << (window - 1), 2)]
+
+
+def tau_wnaf(element: Tuple[int, int], window: int, mu: int) -> List[int]:
+    # Цифры τ-адического w-NAF от младшей к старшей: цифра u означает слагаемое α_u (u < 0 - -α_|u|),
+    # r = sum(d_i * τ^i); между ненулевыми цифрами не меньше w - 1 нулей
+    modulus = 1 << window
+    half = modulus >> 1
+    # Образ τ в Z / 2^w: t = 2 * U_(w-1) / U_w, где U - последовательность Люка U_(k+1) = μU_k - 2U_(k-1)
+    previous, current = 0, 1
+    for _ in range(window - 1):
+        previous, current = current, mu * current - 2 * previous
+    t = 2 * previous * pow(current, -1, modulus) % modulus
+    representatives = tau_wnaf_representatives(window, mu)
+
+    r0, r1 = element
+    digits = []
+    while r0 or r1:
+        digit = 0
+        if r0 & 1:
+            digit = (r0 + r1 * t) & (modulus - 1)
+            if digit >= half:
+                digit -= modulus
+            beta, gamma = representatives[abs(digit) >> 1]
+            if digit > 0:
+                r0, r1 = r0 - beta, r1 - gamma
+            else:
+                r0, r1 = r0 + beta, r1 + gamma
+        digits.append(digit)
+        r0, r1 = r1 + mu * (r0 >> 1), -(r0 >> 1)  # деление на τ: (r0 + r1τ) / τ, r0 четно
+    return digits
@@ -0,0 +1,77 @@
+import os.path
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from calculator.errors import ParserError
+from calculator.parser import Parser
+from calculator.task import estimate_task_cost
+
+
+COST_SAMPLE_TASKS = 1000
+
+
+@dataclass
+class FileJob:
+    filename: str
+    predicted_cost: int
+    actual_time: Optional[float] = None
+
+
+class _CountingLines:
+    # Итератор строк файла, считающий прочитанные символы
+    def __init__(self, lines: Iterable[str]):
+        self._lines = iter(lines)
+        self.chars = 0
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        self.chars += len(line)
+        return line
+
+
+def estimate_file_cost(filename: str, parser: Parser) -> int:
+    # Файл целиком не разбирается (это работа воркера): стоимость первых задач переносится на весь файл
+    # пропорционально размеру, так оценка стоит одинаково мало на файле из тысячи и из миллиона строк
+    try:
+        file_size = os.path.getsize(filename)
+        with open(filename, 'r') as input_f:
+            input_lines = _CountingLines(input_f)
+            config = parser.parse(input_lines=input_lines, streaming=True)
+            header_chars = input_lines.chars
+            field_bits = config.field_bit_length()
+            sample = list(islice(config.task_configs, COST_SAMPLE_TASKS))
+            cost = sum(estimate_task_cost(task, config.field_type, field_bits) for task in sample)
+            sample_chars = input_lines.chars - header_chars
+            if len(sample) < COST_SAMPLE_TASKS or not sample_chars:
+                return cost  # файл прочитан до конца
+            return cost * max(file_size - header_chars, sample_chars) // sample_chars
+    except (ParserError, ValueError, OSError):
+        # Ошибку покажет сам запуск файла, в очереди такой файл идет последним
+        return 0
+
+
+def schedule_files(filenames: Iterable[str], parser: Parser) -> List[FileJob]:
+    # Самые дорогие файлы отправляются первыми, чтобы в конце не ждать одного долгого воркера
+    jobs = [FileJob(filename, estimate_file_cost(filename, parser)) for filename in filenames]
+    jobs.sort(key=lambda job: job.predicted_cost, reverse=True)
+    return jobs
+
+
+def format_cost_report(jobs: List[FileJob]) -> str:
+    # Прогноз в наносекундах; отношение факт/прогноз показывает, насколько модель стоимости ошибается на файле
+    lines = [f'{"Файл":<40} {"Прогноз, с":>12} {"Факт, с":>10} {"Факт/прогноз":>14}']
+    for job in jobs:
+        predicted = job.predicted_cost / 10 ** 9
+        if job.actual_time is None:
+            lines.append(f'{job.filename:<40} {predicted:>12.3f} {"-":>10} {"-":>14}')
+            continue
+        ratio = job.actual_time / predicted if predicted else 0.0
+        lines.append(f'{job.filename:<40} {predicted:>12.3f} {job.actual_time:>10.3f} {ratio:>14.2f}')
+    return '\n'.join(lines)
@@ -1,29 +1,65 @@
+from collections import Counter
+from collections import deque
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
 from enum import auto
 from enum import Enum
+from functools import partial
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Generic
 from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import TypeVar
 from typing import Union
 
+from calculator.elliptic import choose_pippenger_window
 from calculator.elliptic import Curve
+from calculator.elliptic import CurveGroup
+from calculator.elliptic import GF2KoblitzCurve
 from calculator.elliptic import GF2NotSupersingularCurve
 from calculator.elliptic import GF2SupersingularCurve
 from calculator.elliptic import Point
 from calculator.elliptic import ZpCurve
 from calculator.irreducible import get_irreducible_polynomial
+from calculator.named_curves import find_named_curve
+from calculator.named_curves import load_generator_table
+from calculator.named_curves import NamedCurve
 from calculator.polynomial import Polynomial
 
 
 T = TypeVar('T')
 
+FIXED_BASE_THRESHOLD = 4
+FIXED_BASE_MAX_TRACKED = 1 << 16  # столько разных точек помнит счетчик умножений между окнами
+ADD_BATCH_SIZE = 256
+RUN_WINDOW_SIZE = 4096  # столько задач одновременно держится в памяти при последовательном счете
+# Оценка стоимости задачи в наносекундах: на бит поля (и на бит скаляра для умножения).
+# Арифметика GF(2^m) идет в Python-циклах и на бит заметно дороже Z_p, где умножение длинных чисел выполняется в C
+MUL_COST_PER_BIT = {'Z_p': 30, 'GF': 700}
+ADD_COST_PER_BIT = {'Z_p': 100, 'GF': 600}
+TASK_COST_OVERHEAD = 5000
+PARALLEL_CHUNK_COST = 10 ** 8  # порядка 0.1 секунды вычислений на порцию
+PARALLEL_CHUNK_MAX_TASKS = 10000
+PARALLEL_MAX_PENDING_CHUNKS = 64
+# Ненулевые коэффициенты a1..a5 несуперсингулярной кривой над GF(2^m); a3 (при x^2) может быть нулем,
+# как у кривых Коблица K-233..K-571
+NOT_SUPERSINGULAR_COEFFICIENTS = ([True, False, True, False, True], [True, False, False, False, True])
+
 
 class TaskType(Enum):
     ADD = auto()
     MUL = auto()
+    LINEAR_COMBINATION = auto()
+    MULTI_SCALAR_MUL = auto()
+    X_ONLY_MUL = auto()
 
 
 class FieldType(Enum):
@@ -37,8 +73,10 @@ class TaskConfig(Generic[T]):
     points: Union[
         Tuple[Point[T], Point[T]],
         Tuple[Point[T]],
+        Tuple[Point[T], ...],
     ]
     scalar: Optional[int] = None
+    scalars: Optional[Tuple[int, ...]] = None  # коэффициенты линейной комбинации, по одному на точку
 
 
 @dataclass(unsafe_hash=True)
@@ -47,18 +85,43 @@ class TaskResult(Generic[T]):
     result: Point[T]
 
 
+@dataclass
+class TaskProfile(Generic[T]):
+    task_config: Optional[TaskConfig[T]]  # None - построение таблиц предвычислений перед окном задач
+    wall_time: float
+    counts: Counter
+
+
 @dataclass(unsafe_hash=True)
 class TaskRunnerConfig(Generic[T]):
     field_type: FieldType
     field_args: List[Union[int, Polynomial]]
     curve_args: List[Union[int, Polynomial]]
-    task_configs: List[TaskConfig[T]]
+    task_configs: Iterable[TaskConfig[T]]  # список или ленивый итератор (потоковый разбор)
+
+    def curve_key(self) -> Tuple[Any, ...]:
+        return self.field_type, tuple(self.field_args), tuple(self.curve_args)
+
+    def field_bit_length(self) -> int:
+        # Размер поля без построения кривой (нужен для оценки стоимости файла до запуска)
+        p = self.field_args[0]
+        if self.field_type is FieldType.GF:
+            return p if isinstance(p, int) else len(p) - 1
+        return p.bit_length()
+
+    def supports_x_only_mul(self) -> bool:
+        # Лестница Монтгомери (задача x) есть только у несуперсингулярных кривых над GF(2^m)
+        if self.field_type is not FieldType.GF:
+            return False
+        return [bool(arg.bits) for arg in self.curve_args] in NOT_SUPERSINGULAR_COEFFICIENTS
 
     def build_runner(self):
         curve = None
+        named_curve = None
 
         if self.field_type is FieldType.Z_p:
-            curve = ZpCurve(*self.field_args, *self.curve_args)
+            named_curve = find_named_curve(self.field_type.name, self.field_args[0], tuple(self.curve_args))
+            curve = ZpCurve(*self.field_args, *self.curve_args, group=self._named_curve_group(named_curve, int))
         elif self.field_type is FieldType.GF:
             p: Union[int, Polynomial] = self.field_args[0]
             if isinstance(p, int):
@@ -68,30 +131,172 @@ class TaskRunnerConfig(Generic[T]):
             except ValueError:
                 raise ValueError('Неверное число коэффициентов эллиптической кривой')
 
+            named_curve = find_named_curve(self.field_type.name, p.bits, tuple(arg.bits for arg in self.curve_args))
+            group = self._named_curve_group(named_curve, Polynomial)
             bool_args = list(map(lambda poly: bool(poly.bits), self.curve_args))
-            if bool_args == [True, False, True, False, True]:
-                curve = GF2NotSupersingularCurve(p, a1, a3, a5)
+            if bool_args in NOT_SUPERSINGULAR_COEFFICIENTS:
+                # Кривая Коблица: a1 = a5 = 1, a3 in {0, 1} - умножение через Фробениус вместо удвоений
+                koblitz = a1.bits == 1 and a3.bits in (0, 1) and a5.bits == 1
+                curve_cls = GF2KoblitzCurve if koblitz else GF2NotSupersingularCurve
+                curve = curve_cls(p, a1, a3, a5, group=group)
             elif bool_args == [False, True, False, True, True]:
-                curve = GF2SupersingularCurve(p, a2, a4, a5)
+                curve = GF2SupersingularCurve(p, a2, a4, a5, group=group)
             else:
                 raise ValueError('Неизвестная комбинация коэффициентов эллиптической кривой для конечного поля')
 
-        return TaskRunner(curve=curve)
+        if named_curve is not None:
+            # Для стандартной кривой таблица кратных образующей берется готовой с диска
+            curve.register_fixed_base_table(curve.group.generator, partial(load_generator_table, named_curve))
+
+        return TaskRunner(curve=curve, curve_config=replace(self, task_configs=[]))
+
+    @staticmethod
+    def _named_curve_group(named_curve: Optional[NamedCurve], to_element: Callable[[int], Any]) -> Optional[CurveGroup]:
+        # Порядок группы известен только для стандартных кривых
+        if named_curve is None:
+            return None
+        x, y = named_curve.generator
+        return CurveGroup(named_curve.order, named_curve.cofactor, generator=Point(to_element(x), to_element(y)))
+
+
+def estimate_task_cost(task: TaskConfig, field_type: FieldType, field_bits: int) -> int:
+    if task.task_type in (TaskType.MUL, TaskType.X_ONLY_MUL):
+        cost = MUL_COST_PER_BIT[field_type.name] * field_bits * max(abs(task.scalar).bit_length(), 1)
+    elif task.task_type is TaskType.LINEAR_COMBINATION:
+        # Удвоения общие, поэтому каждое слагаемое после первого - примерно половина умножения
+        scalar_bits = max(max(abs(scalar).bit_length() for scalar in task.scalars), 1)
+        cost = MUL_COST_PER_BIT[field_type.name] * field_bits * scalar_bits * (len(task.scalars) + 1) // 2
+    elif task.task_type is TaskType.MULTI_SCALAR_MUL:
+        # По окну c: n + 2^(c-1) сложений в корзины и их сборку, плюс общие удвоения - в единицах бита умножения
+        scalar_bits = max(max(abs(scalar).bit_length() for scalar in task.scalars), 1)
+        window = choose_pippenger_window(len(task.scalars), scalar_bits)
+        point_operations = -(-scalar_bits // window) * (len(task.scalars) + (1 << (window - 1))) + scalar_bits
+        cost = MUL_COST_PER_BIT[field_type.name] * field_bits * point_operations
+    else:
+        cost = ADD_COST_PER_BIT[field_type.name] * field_bits
+    return TASK_COST_OVERHEAD + cost
+
+
+_worker_runners: Dict[Tuple[Any, ...], 'TaskRunner'] = {}
+
+
+def split_into_chunks(tasks: Iterable[TaskConfig[T]], size: int) -> Iterator[List[TaskConfig[T]]]:
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_tasks_chunk(curve_config: TaskRunnerConfig, tasks: List[TaskConfig[T]]) -> List[TaskResult[T]]:
+    # Выполняется в процессе-воркере: кривая (и ее таблицы предвычислений) переиспользуется между порциями
+    key = curve_config.curve_key()
+    if key not in _worker_runners:
+        _worker_runners[key] = curve_config.build_runner()
+    return list(_worker_runners[key].run(tasks))
 
 
 @dataclass
 class TaskRunner:
     curve: Curve[T]
+    fixed_base_threshold: int = FIXED_BASE_THRESHOLD
+    add_batch_size: int = ADD_BATCH_SIZE
+    curve_config: Optional[TaskRunnerConfig] = field(default=None, repr=False)
+    # Сколько раз точка встретилась в задачах MUL за все окна (и порции, пришедшие этому воркеру)
+    _base_counts: Counter = field(default_factory=Counter, init=False, repr=False)
+
+    def run(self, tasks: Iterable[TaskConfig[T]], executor: Optional[Executor] = None) -> Iterable[TaskResult[T]]:
+        if executor is not None and self.curve_config is not None:
+            yield from self._run_parallel(tasks, executor)
+            return
+
+        # Задачи читаются окнами, поэтому память не зависит от длины входа
+        for window in split_into_chunks(tasks, RUN_WINDOW_SIZE):
+            self._precompute_fixed_bases(window)
+            for chunk in split_into_chunks(window, self.add_batch_size):
+                yield from self._run_chunk(chunk)
+
+    def run_instrumented(
+        self,
+        tasks: Iterable[TaskConfig[T]],
+    ) -> Iterator[Tuple[Optional[TaskResult[T]], TaskProfile[T]]]:
+        # Задачи считаются по одной, без общих порций сложений, чтобы счетчики относились к конкретной задаче
+        counts = Counter()
+        self.curve.instrument(counts)
+        for window in split_into_chunks(tasks, RUN_WINDOW_SIZE):
+            started = perf_counter()
+            self._precompute_fixed_bases(window)
+            if counts:
+                yield None, TaskProfile(None, perf_counter() - started, counts.copy())
+                counts.clear()
 
-    def run(self, tasks: List[TaskConfig[T]]) -> Iterable[TaskResult[T]]:
+            for task in window:
+                started = perf_counter()
+                result = self._run_task(task)
+                yield result, TaskProfile(task, perf_counter() - started, counts.copy())
+                counts.clear()
+
+    def _run_parallel(self, tasks: Iterable[TaskConfig[T]], executor: Executor) -> Iterable[TaskResult[T]]:
+        # Порции отправляются воркерам целиком, результаты отдаются в порядке входных задач.
+        # Число порций в работе ограничено, чтобы не читать весь вход заранее
+        pending = deque()
+        for chunk in self._split_by_cost(tasks):
+            pending.append(executor.submit(run_tasks_chunk, self.curve_config, chunk))
+            if len(pending) >= PARALLEL_MAX_PENDING_CHUNKS:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+    def _split_by_cost(self, tasks: Iterable[TaskConfig[T]]) -> Iterator[List[TaskConfig[T]]]:
+        field_type = self.curve_config.field_type
+        field_bits = self.curve.field_bit_length()
+        chunk, chunk_cost = [], 0
+        for task in tasks:
+            chunk.append(task)
+            chunk_cost += estimate_task_cost(task, field_type, field_bits)
+            if chunk_cost >= PARALLEL_CHUNK_COST or len(chunk) >= PARALLEL_CHUNK_MAX_TASKS:
+                yield chunk
+                chunk, chunk_cost = [], 0
+        if chunk:
+            yield chunk
+
+    def _run_chunk(self, tasks: List[TaskConfig[T]]) -> Iterable[TaskResult[T]]:
+        # Сложения из одной порции считаются вместе, с одним обращением в поле на всю порцию
+        add_tasks = [task for task in tasks if task.task_type is TaskType.ADD]
+        sums = iter(self.curve.batch_add([task.points for task in add_tasks]))
         for task in tasks:
-            yield self._run_task(task)
+            if task.task_type is TaskType.ADD:
+                yield TaskResult(task, next(sums))
+            else:
+                yield self._run_task(task)
+
+    def _precompute_fixed_bases(self, tasks: List[TaskConfig[T]]):
+        # Порог сравнивается с числом умножений точки во всем файле, а не в одном окне
+        bases = Counter(task.points[0] for task in tasks if task.task_type is TaskType.MUL)
+        self._base_counts.update(bases)
+        for point in bases:
+            if self._base_counts[point] > self.fixed_base_threshold:
+                self.curve.precompute(point)
+        if len(self._base_counts) > FIXED_BASE_MAX_TRACKED:
+            # Память не растет с длиной входа: редкие точки забываются, частые остаются
+            frequent = self._base_counts.most_common(FIXED_BASE_MAX_TRACKED // 2)
+            self._base_counts.clear()
+            self._base_counts.update(dict(frequent))
 
     def _run_task(self, task: TaskConfig) -> TaskResult[T]:
         if task.task_type is TaskType.ADD:
             result = self.curve.add(task.points[0], task.points[1])
         elif task.task_type is TaskType.MUL:
             result = self.curve.mul(task.points[0], task.scalar)
+        elif task.task_type is TaskType.LINEAR_COMBINATION:
+            result = self.curve.linear_combination(list(zip(task.points, task.scalars)))
+        elif task.task_type is TaskType.MULTI_SCALAR_MUL:
+            result = self.curve.multi_scalar_mul(list(zip(task.points, task.scalars)))
+        elif task.task_type is TaskType.X_ONLY_MUL:
+            result = self.curve.mul(task.points[0], task.scalar, ladder=True, recover_y=False)
         else:
             raise ValueError(f'Операция {task.task_type} не распознана')
         return TaskResult(task, result)